@@ -182,6 +182,9 @@ class ServiceFactory:
             async def classify_chunk(self, chunk):
                 return "general"
 
+            async def classify_chunks(self, chunks):
+                return ["general"] * len(chunks)
+
         return GenerationService(
             cloze_generator=self.create_cloze_generator(),
             vignette_generator=self.create_vignette_generator(),
@@ -8,6 +8,8 @@ from medanki.generation.deduplicator import (
     Deduplicator,
     DuplicateHandleResult,
     DuplicateStatus,
+    EmbeddingStore,
+    QuantizedEmbeddingStore,
 )
 from medanki.generation.service import (
     GenerationConfig,
@@ -34,12 +36,14 @@ __all__ = [
     "DeduplicationResult",
     "DuplicateHandleResult",
     "DuplicateStatus",
+    "EmbeddingStore",
     "GenerationConfig",
     "GenerationError",
     "GenerationResult",
     "GenerationService",
     "GenerationStats",
     "ProgressCallback",
+    "QuantizedEmbeddingStore",
     "CardValidator",
     "ClozeCardInput",
     "ValidationResult",
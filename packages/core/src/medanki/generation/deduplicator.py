@@ -1,11 +1,113 @@
 import hashlib
-import math
+import json
+import os
+import tempfile
+from collections import Counter
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Protocol
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Protocol
+
+import numpy as np
 
 from medanki.models.cards import ClozeCard, VignetteCard
 
+_HEAD_DIM = 64
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms != 0)
+
+
+def _embedding_matrix(vectors: Sequence[Sequence[float]], dim: int | None = None) -> np.ndarray:
+    lengths = [len(vector) for vector in vectors]
+    if dim is None:
+        dim = Counter(lengths).most_common(1)[0][0] if lengths else 0
+    if all(length == dim for length in lengths):
+        return np.asarray(vectors, dtype=np.float32).reshape(len(vectors), dim)
+    matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+    for i, (vector, length) in enumerate(zip(vectors, lengths, strict=True)):
+        if length == dim:
+            matrix[i] = vector
+    return matrix
+
+
+def _similarities(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    if matrix.ndim != 2 or matrix.shape[1] != query.shape[0]:
+        return np.zeros(len(matrix), dtype=np.float32)
+    return matrix @ query
+
+
+def _candidates(
+    rows: np.ndarray,
+    scales: np.ndarray | None,
+    tail_norms: np.ndarray,
+    query: np.ndarray,
+    threshold: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    if rows.ndim != 2 or rows.shape[1] != query.shape[0]:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+
+    head, tail = query[:_HEAD_DIM], query[_HEAD_DIM:]
+    partial = rows[:, :_HEAD_DIM] @ head
+    bound = tail_norms * np.linalg.norm(tail)
+    if scales is not None:
+        partial = partial * scales
+        # Rounding moves each dequantized component by at most half a step.
+        bound = bound + scales * (0.5 * np.abs(query).sum())
+    keep = np.flatnonzero(partial + bound >= threshold)
+
+    rest = rows[keep, _HEAD_DIM:] @ tail
+    if scales is not None:
+        rest = rest * scales[keep]
+    return keep, partial[keep] + rest
+
+
+def _grow(rows: np.ndarray) -> np.ndarray:
+    grown = np.empty((2 * len(rows), *rows.shape[1:]), dtype=rows.dtype)
+    grown[: len(rows)] = rows
+    return grown
+
+
+def _card_content(card: ClozeCard | VignetteCard) -> str:
+    if isinstance(card, ClozeCard):
+        return card.text
+    return card.stem + "".join(opt.text for opt in card.options) + card.answer
+
+
+@lru_cache(maxsize=8192)
+def _content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _embedding_text(card: ClozeCard | VignetteCard) -> str:
+    return card.text if isinstance(card, ClozeCard) else card.stem
+
+
+def _card_keys(cards: Sequence[ClozeCard | VignetteCard]) -> list[str]:
+    return [f"{card.id}:{_content_digest(_card_content(card))}" for card in cards]
+
+
+def _model_name(embedding_client: Any) -> str:
+    name = getattr(embedding_client, "model_name", None)
+    return name if isinstance(name, str) else type(embedding_client).__qualname__
+
+
+def _write_atomic(path: Path, write: Callable[[IO[bytes]], object]) -> None:
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as handle:
+        try:
+            write(handle)
+        except BaseException:
+            handle.close()
+            os.unlink(handle.name)
+            raise
+    os.replace(handle.name, path)
+
 
 class DuplicateStatus(Enum):
     EXACT = "exact"
@@ -13,7 +115,7 @@ class DuplicateStatus(Enum):
     UNIQUE = "unique"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeduplicationResult:
     is_duplicate: bool
     status: DuplicateStatus
@@ -21,14 +123,161 @@ class DeduplicationResult:
     duplicate_of: ClozeCard | VignetteCard | None = None
 
 
-@dataclass
+_NOT_DUPLICATE = DeduplicationResult(
+    is_duplicate=False, status=DuplicateStatus.UNIQUE, similarity_score=0.0
+)
+
+
+@dataclass(frozen=True, slots=True)
 class DuplicateHandleResult:
     card: ClozeCard | VignetteCard | None
     is_marked_duplicate: bool = False
 
 
+class EmbeddingStore:
+    def __init__(self, capacity: int = 1024) -> None:
+        self._capacity = max(capacity, 1)
+        self._rows: np.ndarray | None = None
+        self._tail_norms: np.ndarray | None = np.empty(self._capacity, dtype=np.float32)
+        self._size = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "EmbeddingStore":
+        rows = np.load(path, mmap_mode="r")
+        store = cls(capacity=len(rows))
+        store._rows = rows
+        store._tail_norms = None
+        store._size = len(rows)
+        return store
+
+    def save(self, path: Path) -> None:
+        _write_atomic(path, lambda handle: np.save(handle, self.matrix))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._rows is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._rows[: self._size]
+
+    def append(self, vector: Sequence[float]) -> None:
+        row = _normalize(np.asarray(vector, dtype=np.float32))
+        tail_norms = self._load_tail_norms()
+        if self._rows is not None and row.shape != self._rows.shape[1:]:
+            row = np.zeros(self._rows.shape[1:], dtype=np.float32)
+        if self._rows is None:
+            self._rows = np.empty((self._capacity, row.shape[0]), dtype=np.float32)
+        elif self._size == len(self._rows):
+            self._rows = _grow(self._rows)
+            tail_norms = self._tail_norms = _grow(tail_norms)
+        self._rows[self._size] = row
+        tail_norms[self._size] = np.linalg.norm(row[_HEAD_DIM:])
+        self._size += 1
+
+    def similarities(self, query: np.ndarray) -> np.ndarray:
+        return _similarities(self.matrix, query)
+
+    def candidates(self, query: np.ndarray, threshold: float) -> tuple[np.ndarray, np.ndarray]:
+        return _candidates(
+            self.matrix, None, self._load_tail_norms()[: self._size], query, threshold
+        )
+
+    def _load_tail_norms(self) -> np.ndarray:
+        if self._tail_norms is None:
+            self._tail_norms = np.linalg.norm(self.matrix[:, _HEAD_DIM:], axis=1).astype(np.float32)
+        return self._tail_norms
+
+
+def _scales_path(path: Path) -> Path:
+    return path.with_suffix(".scales.npy")
+
+
+class QuantizedEmbeddingStore:
+    def __init__(self, capacity: int = 1024) -> None:
+        self._capacity = max(capacity, 1)
+        self._codes: np.ndarray | None = None
+        self._scales = np.empty(self._capacity, dtype=np.float32)
+        self._tail_norms: np.ndarray | None = np.empty(self._capacity, dtype=np.float32)
+        self._size = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "QuantizedEmbeddingStore":
+        codes = np.load(path, mmap_mode="r")
+        scales = np.load(_scales_path(path))
+        if codes.dtype != np.int8 or scales.shape != codes.shape[:1]:
+            raise ValueError(f"{path} does not hold int8 codes matching its scales")
+        store = cls(capacity=len(codes))
+        store._codes = codes
+        store._scales = scales.astype(np.float32)
+        store._tail_norms = None
+        store._size = len(codes)
+        return store
+
+    def save(self, path: Path) -> None:
+        codes = self._codes[: self._size] if self._codes is not None else np.empty((0, 0), np.int8)
+        _write_atomic(
+            _scales_path(path), lambda handle: np.save(handle, self._scales[: self._size])
+        )
+        _write_atomic(path, lambda handle: np.save(handle, codes))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dim(self) -> int:
+        return self._codes.shape[1] if self._codes is not None else 0
+
+    def append(self, vector: Sequence[float]) -> None:
+        row = _normalize(np.asarray(vector, dtype=np.float32))
+        peak = float(np.abs(row).max(initial=0.0))
+        scale = peak / 127 if peak else 1.0
+        tail_norms = self._load_tail_norms()
+        if self._codes is not None and row.shape != self._codes.shape[1:]:
+            row = np.zeros(self._codes.shape[1:], dtype=np.float32)
+        if self._codes is None:
+            self._codes = np.empty((self._capacity, row.shape[0]), dtype=np.int8)
+        elif self._size == len(self._codes):
+            self._codes = _grow(self._codes)
+            self._scales = _grow(self._scales)
+            tail_norms = self._tail_norms = _grow(tail_norms)
+        self._codes[self._size] = np.round(row / scale)
+        self._scales[self._size] = scale
+        tail_norms[self._size] = np.linalg.norm(row[_HEAD_DIM:])
+        self._size += 1
+
+    def similarities(self, query: np.ndarray) -> np.ndarray:
+        if self._codes is None:
+            return np.zeros(0, dtype=np.float32)
+        return _similarities(self._codes[: self._size], query) * self._scales[: self._size]
+
+    def candidates(self, query: np.ndarray, threshold: float) -> tuple[np.ndarray, np.ndarray]:
+        if self._codes is None:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        return _candidates(
+            self._codes[: self._size],
+            self._scales[: self._size],
+            self._load_tail_norms()[: self._size],
+            query,
+            threshold,
+        )
+
+    def _load_tail_norms(self) -> np.ndarray:
+        if self._tail_norms is None:
+            codes = self._codes[: self._size] if self._codes is not None else np.empty((0, 0))
+            norms = np.linalg.norm(codes[:, _HEAD_DIM:], axis=1) * self._scales[: self._size]
+            self._tail_norms = norms.astype(np.float32)
+        return self._tail_norms
+
+
 class IEmbeddingClient(Protocol):
     async def embed(self, text: str) -> list[float]: ...
+    async def embed_batch(self, texts: Sequence[str]) -> list[list[float]]: ...
 
 
 class IDatabase(Protocol):
@@ -44,25 +293,31 @@ class Deduplicator:
         embedding_client: IEmbeddingClient | None = None,
         database: IDatabase | None = None,
         similarity_threshold: float = 0.9,
+        quantize: bool = False,
+        fast_reject: bool = False,
+        embedding_cache: str | Path | None = None,
     ):
         self.embedding_client = embedding_client
         self.database = database
         self.similarity_threshold = similarity_threshold
+        self.quantize = quantize
+        self.fast_reject = fast_reject
+        self.embedding_cache = (
+            Path(embedding_cache).with_suffix(".npy") if embedding_cache else None
+        )
+        self._existing_keys: list[str] = []
+        self._existing_embeddings: EmbeddingStore | QuantizedEmbeddingStore | None = None
 
     def compute_content_hash(self, card: ClozeCard | VignetteCard) -> str:
-        if isinstance(card, ClozeCard):
-            content = card.text
-        else:
-            content = card.stem + "".join(opt.text for opt in card.options) + card.answer
-        return hashlib.sha256(content.encode()).hexdigest()
+        return _content_digest(_card_content(card))
 
     def check_duplicate(
         self, card: ClozeCard | VignetteCard, existing_cards: list[ClozeCard | VignetteCard]
     ) -> DeduplicationResult:
-        card_hash = self.compute_content_hash(card)
+        content = _card_content(card)
 
         for existing in existing_cards:
-            if self.compute_content_hash(existing) == card_hash:
+            if _card_content(existing) == content:
                 return DeduplicationResult(
                     is_duplicate=True,
                     status=DuplicateStatus.EXACT,
@@ -70,51 +325,28 @@ class Deduplicator:
                     duplicate_of=existing,
                 )
 
-        return DeduplicationResult(
-            is_duplicate=False, status=DuplicateStatus.UNIQUE, similarity_score=0.0
-        )
+        return _NOT_DUPLICATE
 
     async def check_semantic_duplicate(
         self, card: ClozeCard | VignetteCard, existing_cards: list[ClozeCard | VignetteCard]
     ) -> DeduplicationResult:
         if not self.embedding_client:
-            return DeduplicationResult(
-                is_duplicate=False, status=DuplicateStatus.UNIQUE, similarity_score=0.0
-            )
-
-        card_text = card.text if isinstance(card, ClozeCard) else card.stem
-        card_embedding = await self.embedding_client.embed(card_text)
-
-        max_similarity = 0.0
-        most_similar_card = None
-
-        for existing in existing_cards:
-            existing_text = existing.text if isinstance(existing, ClozeCard) else existing.stem
-            existing_embedding = await self.embedding_client.embed(existing_text)
+            return _NOT_DUPLICATE
 
-            similarity = self._cosine_similarity(card_embedding, existing_embedding)
-
-            if similarity > max_similarity:
-                max_similarity = similarity
-                most_similar_card = existing
-
-        if max_similarity >= self.similarity_threshold:
-            return DeduplicationResult(
-                is_duplicate=True,
-                status=DuplicateStatus.SEMANTIC,
-                similarity_score=max_similarity,
-                duplicate_of=most_similar_card,
-            )
+        if not existing_cards:
+            return _NOT_DUPLICATE
 
-        return DeduplicationResult(
-            is_duplicate=False, status=DuplicateStatus.UNIQUE, similarity_score=max_similarity
+        card_embedding, *existing_embeddings = await self.embedding_client.embed_batch(
+            [_embedding_text(card), *(_embedding_text(existing) for existing in existing_cards)]
         )
 
+        query = _normalize(np.asarray(card_embedding, dtype=np.float32))
+        matrix = _normalize(_embedding_matrix(existing_embeddings, len(card_embedding)))
+        return self._most_similar(_similarities(matrix, query), existing_cards)
+
     async def check_against_existing(self, card: ClozeCard | VignetteCard) -> DeduplicationResult:
         if not self.database:
-            return DeduplicationResult(
-                is_duplicate=False, status=DuplicateStatus.UNIQUE, similarity_score=0.0
-            )
+            return _NOT_DUPLICATE
 
         existing_cards = self.database.get_existing_cards()
 
@@ -122,12 +354,20 @@ class Deduplicator:
         if exact_result.is_duplicate:
             return exact_result
 
-        if self.embedding_client:
-            return await self.check_semantic_duplicate(card, existing_cards)
+        if self.embedding_client and existing_cards:
+            card_embedding = await self.embedding_client.embed(_embedding_text(card))
+            query = _normalize(np.asarray(card_embedding, dtype=np.float32))
+            store = await self._load_existing_embeddings(
+                self.database, self.embedding_client, existing_cards, len(query)
+            )
+            if self.fast_reject:
+                # Duplicates match the full scan, but a UNIQUE score only covers the rows that
+                # survived pruning, and is 0.0 when none did.
+                keep, similarities = store.candidates(query, self.similarity_threshold)
+                return self._most_similar(similarities, [existing_cards[i] for i in keep])
+            return self._most_similar(store.similarities(query), existing_cards)
 
-        return DeduplicationResult(
-            is_duplicate=False, status=DuplicateStatus.UNIQUE, similarity_score=0.0
-        )
+        return _NOT_DUPLICATE
 
     def handle_duplicate(
         self, card: ClozeCard | VignetteCard, result: DeduplicationResult, action: str = "mark"
@@ -141,26 +381,115 @@ class Deduplicator:
         return DuplicateHandleResult(card=card, is_marked_duplicate=True)
 
     def deduplicate(self, cards: list[ClozeCard | VignetteCard]) -> list[ClozeCard | VignetteCard]:
-        seen_hashes: set[str] = set()
-        unique_cards: list[ClozeCard | VignetteCard] = []
-
+        unique_cards: dict[str, ClozeCard | VignetteCard] = {}
         for card in cards:
-            card_hash = self.compute_content_hash(card)
-            if card_hash not in seen_hashes:
-                seen_hashes.add(card_hash)
-                unique_cards.append(card)
+            unique_cards.setdefault(_card_content(card), card)
+        return list(unique_cards.values())
 
-        return unique_cards
+    def _most_similar(
+        self, similarities: np.ndarray, candidates: list[ClozeCard | VignetteCard]
+    ) -> DeduplicationResult:
+        if len(similarities) == 0:
+            return _NOT_DUPLICATE
 
-    def _cosine_similarity(self, vec1: list[float], vec2: list[float]) -> float:
-        if len(vec1) != len(vec2):
-            return 0.0
+        best = int(np.argmax(similarities))
+        max_similarity = max(float(similarities[best]), 0.0)
+        most_similar_card = candidates[best]
 
-        dot_product = sum(a * b for a, b in zip(vec1, vec2, strict=False))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
+        if max_similarity >= self.similarity_threshold:
+            return DeduplicationResult(
+                is_duplicate=True,
+                status=DuplicateStatus.SEMANTIC,
+                similarity_score=max_similarity,
+                duplicate_of=most_similar_card,
+            )
 
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        return DeduplicationResult(
+            is_duplicate=False, status=DuplicateStatus.UNIQUE, similarity_score=max_similarity
+        )
 
-        return dot_product / (norm1 * norm2)
+    async def _load_existing_embeddings(
+        self,
+        database: IDatabase,
+        embedding_client: IEmbeddingClient,
+        existing_cards: list[ClozeCard | VignetteCard],
+        dim: int,
+    ) -> EmbeddingStore | QuantizedEmbeddingStore:
+        keys = _card_keys(existing_cards)
+        indexed = len(self._existing_keys)
+        store = self._existing_embeddings
+        if store is not None and keys[:indexed] == self._existing_keys:
+            if len(keys) > indexed:
+                new_cards = existing_cards[indexed:]
+                vectors = await self._fetch_embeddings(database, embedding_client, new_cards)
+                for vector in vectors:
+                    store.append(vector)
+                self._existing_keys = keys
+            return store
+
+        store_type = QuantizedEmbeddingStore if self.quantize else EmbeddingStore
+        metadata = {
+            "model": _model_name(embedding_client),
+            "dim": dim,
+            "store": store_type.__name__,
+            "cards": keys,
+        }
+        store = self._load_embedding_cache(store_type, metadata)
+        if store is None:
+            fetched = await self._fetch_embeddings(database, embedding_client, existing_cards)
+            store = store_type(capacity=len(existing_cards))
+            for vector in _embedding_matrix(fetched, dim):
+                store.append(vector)
+            self._save_embedding_cache(store, metadata)
+
+        self._existing_keys = keys
+        self._existing_embeddings = store
+        return store
+
+    async def _fetch_embeddings(
+        self,
+        database: IDatabase,
+        embedding_client: IEmbeddingClient,
+        cards: list[ClozeCard | VignetteCard],
+    ) -> list[Any]:
+        stored = database.get_card_embeddings(cards)
+        vectors = [stored.get(card.id) for card in cards]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = await embedding_client.embed_batch(
+                [_embedding_text(cards[i]) for i in missing]
+            )
+            for i, vector in zip(missing, embedded, strict=True):
+                vectors[i] = vector
+        return vectors
+
+    def _load_embedding_cache(
+        self,
+        store_type: type[EmbeddingStore] | type[QuantizedEmbeddingStore],
+        metadata: dict[str, Any],
+    ) -> EmbeddingStore | QuantizedEmbeddingStore | None:
+        if self.embedding_cache is None or not self.embedding_cache.exists():
+            return None
+        metadata_path = self.embedding_cache.with_suffix(".meta.json")
+        if not metadata_path.exists():
+            return None
+        try:
+            if json.loads(metadata_path.read_text()) != metadata:
+                return None
+            store = store_type.load(self.embedding_cache)
+        except (OSError, ValueError):
+            return None
+        if len(store) != len(metadata["cards"]) or store.dim != metadata["dim"]:
+            return None
+        return store
+
+    def _save_embedding_cache(
+        self, store: EmbeddingStore | QuantizedEmbeddingStore, metadata: dict[str, Any]
+    ) -> None:
+        if self.embedding_cache is None:
+            return
+        metadata_path = self.embedding_cache.with_suffix(".meta.json")
+        # Drop the old sidecar first so a crash mid-save leaves no valid-looking set.
+        metadata_path.unlink(missing_ok=True)
+        store.save(self.embedding_cache)
+        _write_atomic(metadata_path, lambda handle: handle.write(json.dumps(metadata).encode()))
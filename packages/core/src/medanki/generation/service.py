@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import time
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Protocol, runtime_checkable
 from uuid import UUID
 
+from medanki.exceptions import MedAnkiError
 from medanki.models.cards import ClozeCard, VignetteCard
 
 if TYPE_CHECKING:
@@ -13,6 +16,8 @@ if TYPE_CHECKING:
 
     from medanki.services.protocols import Chunk, Document
 
+logger = logging.getLogger(__name__)
+
 
 @runtime_checkable
 class IClozeGenerator(Protocol):
@@ -58,7 +63,12 @@ class IClassifier(Protocol):
     async def classify_chunk(self, chunk: Chunk) -> str: ...
 
 
-@dataclass
+@runtime_checkable
+class IBatchClassifier(Protocol):
+    async def classify_chunks(self, chunks: Sequence[Chunk]) -> list[str]: ...
+
+
+@dataclass(frozen=True, slots=True)
 class GenerationConfig:
     enable_cloze: bool = True
     enable_vignettes: bool = True
@@ -66,9 +76,10 @@ class GenerationConfig:
     max_vignette_per_chunk: int = 1
     check_hallucination: bool = False
     min_confidence: float = 0.5
+    max_concurrency: int = 8
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GenerationStats:
     total_cards: int = 0
     cloze_count: int = 0
@@ -78,13 +89,13 @@ class GenerationStats:
     chunks_failed: int = 0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GenerationError:
     chunk_id: UUID
     error_message: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GenerationResult:
     cards: list[ClozeCard | VignetteCard] = field(default_factory=list)
     stats: GenerationStats = field(default_factory=GenerationStats)
@@ -118,53 +129,46 @@ class GenerationService:
         chunks_processed = 0
         chunks_failed = 0
         total_chunks = len(chunks)
+        completed = 0
+        semaphore = asyncio.Semaphore(max(config.max_concurrency, 1))
+        classified = await self._classify_batch(chunks)
+
+        async def run(
+            chunk: Chunk,
+        ) -> tuple[list[ClozeCard | VignetteCard], GenerationError | None]:
+            nonlocal completed
+            async with semaphore:
+                try:
+                    cards = await self._process_chunk(chunk, config, topic_id, classified)
+                    error = None
+                except Exception as e:
+                    cards, error = [], GenerationError(chunk_id=chunk.id, error_message=str(e))
+
+            completed += 1
+            if on_progress:
+                on_progress(completed, total_chunks)
+            return cards, error
 
-        for i, chunk in enumerate(chunks):
-            try:
-                await self.classifier.classify_chunk(chunk)
-
-                chunk_cards: list[ClozeCard | VignetteCard] = []
-
-                if config.enable_cloze:
-                    cloze_cards = await self.cloze_generator.generate(
-                        content=chunk.content,
-                        source_chunk_id=chunk.id,
-                        topic_id=topic_id,
-                        num_cards=config.max_cloze_per_chunk,
-                    )
-                    chunk_cards.extend(cloze_cards)
-
-                if config.enable_vignettes:
-                    vignette_cards = await self.vignette_generator.generate(
-                        content=chunk.content,
-                        source_chunk_id=chunk.id,
-                        topic_id=topic_id,
-                        num_cards=config.max_vignette_per_chunk,
-                    )
-                    chunk_cards.extend(vignette_cards)
-
-                validated_cards: list[ClozeCard | VignetteCard] = []
-                for card in chunk_cards:
-                    source_content = chunk.content if config.check_hallucination else None
-                    is_valid, _ = await self.validator.validate(card, source_content)
-                    if is_valid:
-                        validated_cards.append(card)
-
-                all_cards.extend(validated_cards)
-                chunks_processed += 1
+        outcomes = await asyncio.gather(*(run(chunk) for chunk in chunks))
 
-            except Exception as e:
-                errors.append(GenerationError(chunk_id=chunk.id, error_message=str(e)))
+        for cards, error in outcomes:
+            if error is None:
+                all_cards.extend(cards)
+                chunks_processed += 1
+            else:
+                errors.append(error)
                 chunks_failed += 1
 
-            if on_progress:
-                on_progress(i + 1, total_chunks)
-
         deduplicated_cards = self.deduplicator.deduplicate(all_cards)
 
         duration = time.monotonic() - start_time
-        cloze_count = sum(1 for c in deduplicated_cards if isinstance(c, ClozeCard))
-        vignette_count = sum(1 for c in deduplicated_cards if isinstance(c, VignetteCard))
+        cloze_count = 0
+        vignette_count = 0
+        for card in deduplicated_cards:
+            if isinstance(card, ClozeCard):
+                cloze_count += 1
+            elif isinstance(card, VignetteCard):
+                vignette_count += 1
 
         stats = GenerationStats(
             total_cards=len(deduplicated_cards),
@@ -177,6 +181,67 @@ class GenerationService:
 
         return GenerationResult(cards=deduplicated_cards, stats=stats, errors=errors)
 
+    async def _process_chunk(
+        self,
+        chunk: Chunk,
+        config: GenerationConfig,
+        topic_id: str | None,
+        classified: bool = False,
+    ) -> list[ClozeCard | VignetteCard]:
+        if not classified:
+            await self.classifier.classify_chunk(chunk)
+
+        generations = []
+        if config.enable_cloze:
+            generations.append(
+                self.cloze_generator.generate(
+                    content=chunk.content,
+                    source_chunk_id=chunk.id,
+                    topic_id=topic_id,
+                    num_cards=config.max_cloze_per_chunk,
+                )
+            )
+        if config.enable_vignettes:
+            generations.append(
+                self.vignette_generator.generate(
+                    content=chunk.content,
+                    source_chunk_id=chunk.id,
+                    topic_id=topic_id,
+                    num_cards=config.max_vignette_per_chunk,
+                )
+            )
+
+        tasks = [asyncio.ensure_future(generation) for generation in generations]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        chunk_cards: list[ClozeCard | VignetteCard] = []
+        for generated in results:
+            chunk_cards.extend(generated)
+
+        source_content = chunk.content if config.check_hallucination else None
+        validated_cards: list[ClozeCard | VignetteCard] = []
+        for card in chunk_cards:
+            is_valid, _ = await self.validator.validate(card, source_content)
+            if is_valid:
+                validated_cards.append(card)
+
+        return validated_cards
+
+    async def _classify_batch(self, chunks: Sequence[Chunk]) -> bool:
+        if not chunks or not isinstance(self.classifier, IBatchClassifier):
+            return False
+        try:
+            await self.classifier.classify_chunks(chunks)
+        except (MedAnkiError, OSError) as e:
+            logger.warning("Batch classification failed, classifying chunks one by one: %s", e)
+            return False
+        return True
+
     async def generate_from_document(
         self,
         document: Document,
@@ -1,10 +1,9 @@
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Protocol
+from typing import Any, Protocol
 
-if TYPE_CHECKING:
-    from medanki.models.cards import ClozeCard, VignetteCard
+from medanki.models.cards import ClozeCard, VignetteCard
 
 
 class ValidationStatus(Enum):
@@ -53,11 +52,9 @@ class CardValidator:
 
     async def validate(
         self,
-        card: "ClozeCard | VignetteCard",
+        card: ClozeCard | VignetteCard,
         source_content: str | None = None,
     ) -> tuple[bool, list[str]]:
-        from medanki.models.cards import ClozeCard, VignetteCard
-
         issues: list[str] = []
 
         if isinstance(card, ClozeCard):
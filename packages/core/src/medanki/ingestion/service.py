@@ -22,6 +22,9 @@ HEADER_FOOTER_PATTERNS = [
     re.compile(r"^\s*\d+\s*$", re.MULTILINE),
 ]
 
+HORIZONTAL_WHITESPACE_PATTERN = re.compile(r"[ \t]+")
+EXCESS_NEWLINES_PATTERN = re.compile(r"\n{3,}")
+
 EXTENSION_TO_CONTENT_TYPE = {
     ".pdf": ContentType.PDF_TEXTBOOK,
     ".md": ContentType.MARKDOWN,
@@ -235,8 +238,8 @@ class IngestionService:
         Returns:
             Text with normalized whitespace.
         """
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
+        text = HORIZONTAL_WHITESPACE_PATTERN.sub(" ", text)
+        text = EXCESS_NEWLINES_PATTERN.sub("\n\n", text)
         return text.strip()
 
     def _strip_headers_footers(self, text: str) -> str:
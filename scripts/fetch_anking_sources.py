@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import typer
@@ -19,8 +20,10 @@ RESOURCE_SHEETS = {
     "sketchy": "https://docs.google.com/spreadsheets/d/1tPFMKQ6lCDuS8vgn8HTWKh3omDXrUHzCvmoFzogr2CQ/export?format=csv",
 }
 
+_MAX_SHEET_WORKERS = 4
 
-def clone_anking_repo(target_dir: Path, shallow: bool = True) -> bool:
+
+def clone_anking_repo(target_dir: Path, shallow: bool = True, partial: bool = False) -> bool:
     target_path = target_dir / "AnKing-v11"
 
     if target_path.exists():
@@ -32,6 +35,8 @@ def clone_anking_repo(target_dir: Path, shallow: bool = True) -> bool:
     cmd = ["git", "clone"]
     if shallow:
         cmd.extend(["--depth", "1"])
+    elif partial:
+        cmd.append("--filter=blob:none")
     cmd.extend([ANKING_REPO_URL, str(target_path)])
 
     typer.echo(f"Cloning AnKing-v11 to {target_path}...")
@@ -55,17 +60,22 @@ def fetch_resource_sheets(target_dir: Path) -> dict[str, bool]:
     target_dir.mkdir(parents=True, exist_ok=True)
     results = {}
 
-    for name, url in RESOURCE_SHEETS.items():
+    typer.echo(f"Fetching {', '.join(RESOURCE_SHEETS)} sheets...")
+    with ThreadPoolExecutor(max_workers=_MAX_SHEET_WORKERS) as executor:
+        downloads = {
+            name: executor.submit(pd.read_csv, url) for name, url in RESOURCE_SHEETS.items()
+        }
+
+    for name, download in downloads.items():
         output_path = target_dir / f"{name}.csv"
-        typer.echo(f"Fetching {name} sheet...")
 
         try:
-            df = pd.read_csv(url)
+            df = download.result()
             df.to_csv(output_path, index=False)
-            typer.echo(f"  Saved {len(df)} rows to {output_path}")
+            typer.echo(f"  {name}: saved {len(df)} rows to {output_path}")
             results[name] = True
         except Exception as e:
-            typer.echo(f"  Failed: {e}", err=True)
+            typer.echo(f"  {name}: failed: {e}", err=True)
             results[name] = False
 
     return results
@@ -116,9 +126,13 @@ def clone(
         False,
         help="Clone full history (not shallow)",
     ),
+    partial: bool = typer.Option(
+        False,
+        help="With --full, fetch historical file contents on demand (needs network later)",
+    ),
 ) -> None:
     """Clone the AnKing-v11 repository."""
-    clone_anking_repo(data_dir, shallow=not full)
+    clone_anking_repo(data_dir, shallow=not full, partial=partial)
 
 
 @app.command()
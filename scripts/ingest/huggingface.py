@@ -12,7 +12,9 @@ from __future__ import annotations
 
 import json
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -24,6 +26,8 @@ app = typer.Typer(help="Hugging Face dataset ingestion for MedAnki")
 
 REQUIRED_MEDMCQA_FIELDS = {"subject_name", "topic_name", "question"}
 
+_MEDMCQA_TOPIC_COLUMNS = sorted(REQUIRED_MEDMCQA_FIELDS)
+
 SUBJECT_TO_TAXONOMY = {
     "Anatomy": "organ_systems",
     "Physiology": "organ_systems",
@@ -49,6 +53,18 @@ SUBJECT_TO_TAXONOMY = {
 }
 
 
+_TOPIC_ABBREVIATIONS = {
+    "central nervous system": "cns",
+    "cardiovascular": "cvs",
+    "gastrointestinal": "gi",
+    "genitourinary": "gu",
+}
+
+_KEYWORD_RE = re.compile(r"\b\w+\b")
+
+_MAX_DOWNLOAD_WORKERS = 4
+
+
 @dataclass
 class DatasetConfig:
     """Configuration for a Hugging Face dataset."""
@@ -63,15 +79,19 @@ class DatasetConfig:
 class TopicStats:
     """Tracks topic statistics across subjects."""
 
-    _subjects: dict[str, dict[str, int]] = field(
-        default_factory=lambda: defaultdict(lambda: defaultdict(int))
-    )
+    _subjects: dict[str, Counter[str]] = field(default_factory=lambda: defaultdict(Counter))
     _totals: dict[str, int] = field(default_factory=lambda: defaultdict(int))
 
     def add_topic(self, subject: str, topic: str) -> None:
         self._subjects[subject][topic] += 1
         self._totals[subject] += 1
 
+    def add_topics(self, pairs: Iterable[tuple[str, str]]) -> None:
+        """Add many (subject, topic) pairs, counting duplicates in one pass."""
+        for (subject, topic), count in Counter(pairs).items():
+            self._subjects[subject][topic] += count
+            self._totals[subject] += count
+
     def get_subject_count(self, subject: str) -> int:
         return self._totals.get(subject, 0)
 
@@ -84,11 +104,10 @@ class TopicStats:
     def to_dict(self) -> dict[str, Any]:
         result = {}
         for subject, topics in self._subjects.items():
-            sorted_topics = dict(sorted(topics.items(), key=lambda x: -x[1]))
             result[subject] = {
                 "total_questions": self._totals[subject],
                 "unique_topics": len(topics),
-                "topics": sorted_topics,
+                "topics": dict(topics.most_common()),
             }
         return result
 
@@ -141,9 +160,10 @@ def validate_medmcqa_record(record: dict[str, Any]) -> bool:
     return True
 
 
-def extract_medmcqa_topics(splits: list[str] | None = None) -> TopicStats:
+def extract_medmcqa_topics(splits: list[str] | None = None, ds: Any = None) -> TopicStats:
     """Extract all unique topics from MedMCQA dataset."""
-    ds = load_dataset("openlifescienceai/medmcqa")
+    if ds is None:
+        ds = load_dataset("openlifescienceai/medmcqa")
     stats = TopicStats()
 
     if splits is None:
@@ -152,12 +172,12 @@ def extract_medmcqa_topics(splits: list[str] | None = None) -> TopicStats:
     for split in splits:
         if split not in ds:
             continue
-        for example in ds[split]:
-            if not validate_medmcqa_record(example):
-                continue
-            subject = example["subject_name"]
-            topic = example["topic_name"]
-            stats.add_topic(subject, topic)
+        records = ds[split].select_columns(_MEDMCQA_TOPIC_COLUMNS)
+        stats.add_topics(
+            (record["subject_name"], record["topic_name"])
+            for record in records
+            if validate_medmcqa_record(record)
+        )
 
     return stats
 
@@ -174,24 +194,17 @@ def map_subject_to_taxonomy(subject: str) -> str:
 
 def generate_keywords(topics: list[str]) -> list[str]:
     """Generate searchable keywords from topic names."""
-    keywords = []
-    abbreviations = {
-        "central nervous system": "cns",
-        "cardiovascular": "cvs",
-        "gastrointestinal": "gi",
-        "genitourinary": "gu",
-    }
+    keywords: set[str] = set()
 
     for topic in topics:
         topic_lower = topic.lower()
-        words = re.findall(r"\b\w+\b", topic_lower)
-        keywords.extend(words)
+        keywords.update(_KEYWORD_RE.findall(topic_lower))
 
-        for full, abbrev in abbreviations.items():
+        for full, abbrev in _TOPIC_ABBREVIATIONS.items():
             if full in topic_lower:
-                keywords.append(abbrev)
+                keywords.add(abbrev)
 
-    return list(set(keywords))
+    return list(keywords)
 
 
 def enrich_taxonomy(taxonomy_path: Path, topics_path: Path) -> dict[str, Any]:
@@ -227,14 +240,21 @@ class HuggingFaceIngestor:
 
     def __init__(self, output_dir: Path):
         self.output_dir = output_dir
+        self._datasets: dict[str, Any] = {}
 
     def _ensure_output_dir(self) -> None:
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+    def _load_dataset(self, repo: str) -> Any:
+        """Load a dataset once per ingestor and reuse it on repeat calls."""
+        if repo not in self._datasets:
+            self._datasets[repo] = load_dataset(repo)
+        return self._datasets[repo]
+
     def download_dataset(self, config: DatasetConfig) -> list[Path]:
         """Download a single dataset and save to parquet."""
         self._ensure_output_dir()
-        ds = load_dataset(config.repo)
+        ds = self._load_dataset(config.repo)
         paths = []
 
         for split in ds:
@@ -246,19 +266,28 @@ class HuggingFaceIngestor:
 
     def download_all(self) -> dict[str, list[Path]]:
         """Download all configured datasets."""
+        configs = get_dataset_configs()
+        workers = max(1, min(len(configs), _MAX_DOWNLOAD_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            downloads = {
+                config.name: executor.submit(self.download_dataset, config) for config in configs
+            }
+
         results = {}
-        for config in get_dataset_configs():
+        for name, download in downloads.items():
             try:
-                paths = self.download_dataset(config)
-                results[config.name] = paths
+                results[name] = download.result()
             except Exception as e:
-                typer.echo(f"Error downloading {config.name}: {e}", err=True)
+                typer.echo(f"Error downloading {name}: {e}", err=True)
         return results
 
     def extract_topics(self, output_path: Path) -> Path:
         """Extract topics from MedMCQA and save to JSON."""
         self._ensure_output_dir()
-        stats = extract_medmcqa_topics(splits=["train", "validation", "test"])
+        stats = extract_medmcqa_topics(
+            splits=["train", "validation", "test"],
+            ds=self._load_dataset("openlifescienceai/medmcqa"),
+        )
         output_path.parent.mkdir(parents=True, exist_ok=True)
         output_path.write_text(json.dumps(stats.to_dict(), indent=2))
         return output_path
@@ -3,36 +3,97 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import Any
 from unittest.mock import AsyncMock
 from uuid import UUID, uuid4
 
 import pytest
 
-if TYPE_CHECKING:
-    from medanki.generation.cloze import ClozeGenerator
+from medanki.generation.cloze import ClozeGenerator
 
+_CLOZE_RE = re.compile(r"\{\{c(\d+)::([^}]+)\}\}")
+_ANSWER_RE = re.compile(r"\{\{c\d+::([^}]+)\}\}")
 
-async def generate_from_chunk(generator: ClozeGenerator, chunk, count: int = 3):
-    """Helper to call generator with new signature using chunk data."""
-    return await generator.generate(
-        content=chunk.text,
-        source_chunk_id=chunk.id,
-        num_cards=count,
-    )
+_TRIVIAL_WORDS = frozenset(
+    {"the", "a", "an", "is", "are", "was", "were", "be", "been", "of", "to", "and", "or"}
+)
+_JOURNAL_NAMES = frozenset({"nejm", "lancet", "jama", "bmj", "nature", "science", "cell"})
+
+
+def _iter_answers(cards: Iterable[Any]) -> Iterator[str]:
+    """Yield every cloze answer across the given cards."""
+    return (match.group(1) for card in cards for match in _ANSWER_RE.finditer(card.text))
 
 
 # Test fixtures and data classes for testing
-@dataclass
+@dataclass(slots=True)
 class MockClassifiedChunk:
     """Mock classified chunk for testing."""
 
     id: UUID = field(default_factory=uuid4)
     document_id: UUID = field(default_factory=uuid4)
     text: str = ""
-    topics: list[dict[str, str]] = field(default_factory=list)
-    tags: list[str] = field(default_factory=list)
+    topics: tuple[dict[str, Any], ...] = ()
+    tags: tuple[str, ...] = ()
+
+
+_DOCUMENT_ID = UUID("00000000-0000-0000-0000-000000000000")
+_BIO_CHUNK_ID = UUID("00000000-0000-0000-0000-000000000001")
+_PHARM_CHUNK_ID = UUID("00000000-0000-0000-0000-000000000002")
+_ANAT_CHUNK_ID = UUID("00000000-0000-0000-0000-000000000003")
+_BIOCHEM_CHUNK_ID = UUID("00000000-0000-0000-0000-000000000004")
+
+_BIO_TEXT = (
+    "The mitochondria is often called the powerhouse of the cell because "
+    "it produces ATP through oxidative phosphorylation. The Krebs cycle, also known "
+    "as the citric acid cycle, occurs in the mitochondrial matrix and generates "
+    "electron carriers for the electron transport chain."
+)
+
+_PHARM_TEXT = (
+    "Metformin is a biguanide drug that is first-line treatment for "
+    "type 2 diabetes mellitus. It works by decreasing hepatic glucose production "
+    "and increasing insulin sensitivity in peripheral tissues. The drug class "
+    "biguanides are known for their glucose-lowering effects without causing "
+    "hypoglycemia."
+)
+
+_ANAT_TEXT = (
+    "The left anterior descending artery (LAD) is a major coronary artery "
+    "that supplies blood to the anterior wall of the left ventricle. It originates "
+    "from the left main coronary artery and travels in the anterior interventricular "
+    "groove. Occlusion of the LAD can cause anterior myocardial infarction."
+)
+
+_BIOCHEM_TEXT = (
+    "Glycolysis is the metabolic pathway that converts glucose into "
+    "pyruvate. The rate-limiting enzyme is phosphofructokinase-1 (PFK-1), which "
+    "catalyzes the phosphorylation of fructose-6-phosphate to fructose-1,6-bisphosphate. "
+    "This enzyme is allosterically activated by AMP and inhibited by ATP and citrate."
+)
+
+_BIO_TOPICS = (
+    {"id": "1A", "path": "Biology > Cell Biology", "confidence": 0.85},
+    {"id": "2B", "path": "Biochemistry > Metabolism", "confidence": 0.75},
+)
+_BIO_TAGS = ("biology", "biochemistry", "cell-biology", "metabolism")
+
+_PHARM_TOPICS = ({"id": "PHARM1", "path": "Pharmacology > Endocrine", "confidence": 0.9},)
+_PHARM_TAGS = ("pharmacology", "endocrine", "diabetes")
+
+_ANAT_TOPICS = ({"id": "ANAT1", "path": "Anatomy > Cardiovascular", "confidence": 0.92},)
+_ANAT_TAGS = ("anatomy", "cardiovascular", "heart")
+
+_BIOCHEM_TOPICS = (
+    {
+        "id": "BIOCHEM1",
+        "path": "Biochemistry > Carbohydrate Metabolism",
+        "confidence": 0.88,
+    },
+)
+_BIOCHEM_TAGS = ("biochemistry", "metabolism", "glycolysis")
 
 
 @pytest.fixture
@@ -61,15 +122,11 @@ def mock_llm_client() -> AsyncMock:
 def sample_classified_chunk() -> MockClassifiedChunk:
     """Create a sample classified chunk for testing."""
     return MockClassifiedChunk(
-        text="""The mitochondria is often called the powerhouse of the cell because
-        it produces ATP through oxidative phosphorylation. The Krebs cycle, also known
-        as the citric acid cycle, occurs in the mitochondrial matrix and generates
-        electron carriers for the electron transport chain.""",
-        topics=[
-            {"id": "1A", "path": "Biology > Cell Biology", "confidence": 0.85},
-            {"id": "2B", "path": "Biochemistry > Metabolism", "confidence": 0.75},
-        ],
-        tags=["biology", "biochemistry", "cell-biology", "metabolism"],
+        id=_BIO_CHUNK_ID,
+        document_id=_DOCUMENT_ID,
+        text=_BIO_TEXT,
+        topics=_BIO_TOPICS,
+        tags=_BIO_TAGS,
     )
 
 
@@ -77,15 +134,11 @@ def sample_classified_chunk() -> MockClassifiedChunk:
 def sample_pharmacology_chunk() -> MockClassifiedChunk:
     """Create a sample pharmacology chunk for testing."""
     return MockClassifiedChunk(
-        text="""Metformin is a biguanide drug that is first-line treatment for
-        type 2 diabetes mellitus. It works by decreasing hepatic glucose production
-        and increasing insulin sensitivity in peripheral tissues. The drug class
-        biguanides are known for their glucose-lowering effects without causing
-        hypoglycemia.""",
-        topics=[
-            {"id": "PHARM1", "path": "Pharmacology > Endocrine", "confidence": 0.9},
-        ],
-        tags=["pharmacology", "endocrine", "diabetes"],
+        id=_PHARM_CHUNK_ID,
+        document_id=_DOCUMENT_ID,
+        text=_PHARM_TEXT,
+        topics=_PHARM_TOPICS,
+        tags=_PHARM_TAGS,
     )
 
 
@@ -93,14 +146,11 @@ def sample_pharmacology_chunk() -> MockClassifiedChunk:
 def sample_anatomy_chunk() -> MockClassifiedChunk:
     """Create a sample anatomy chunk for testing."""
     return MockClassifiedChunk(
-        text="""The left anterior descending artery (LAD) is a major coronary artery
-        that supplies blood to the anterior wall of the left ventricle. It originates
-        from the left main coronary artery and travels in the anterior interventricular
-        groove. Occlusion of the LAD can cause anterior myocardial infarction.""",
-        topics=[
-            {"id": "ANAT1", "path": "Anatomy > Cardiovascular", "confidence": 0.92},
-        ],
-        tags=["anatomy", "cardiovascular", "heart"],
+        id=_ANAT_CHUNK_ID,
+        document_id=_DOCUMENT_ID,
+        text=_ANAT_TEXT,
+        topics=_ANAT_TOPICS,
+        tags=_ANAT_TAGS,
     )
 
 
@@ -108,26 +158,17 @@ def sample_anatomy_chunk() -> MockClassifiedChunk:
 def sample_biochemistry_chunk() -> MockClassifiedChunk:
     """Create a sample biochemistry chunk for testing."""
     return MockClassifiedChunk(
-        text="""Glycolysis is the metabolic pathway that converts glucose into
-        pyruvate. The rate-limiting enzyme is phosphofructokinase-1 (PFK-1), which
-        catalyzes the phosphorylation of fructose-6-phosphate to fructose-1,6-bisphosphate.
-        This enzyme is allosterically activated by AMP and inhibited by ATP and citrate.""",
-        topics=[
-            {
-                "id": "BIOCHEM1",
-                "path": "Biochemistry > Carbohydrate Metabolism",
-                "confidence": 0.88,
-            },
-        ],
-        tags=["biochemistry", "metabolism", "glycolysis"],
+        id=_BIOCHEM_CHUNK_ID,
+        document_id=_DOCUMENT_ID,
+        text=_BIOCHEM_TEXT,
+        topics=_BIOCHEM_TOPICS,
+        tags=_BIOCHEM_TAGS,
     )
 
 
 @pytest.fixture
 def cloze_generator(mock_llm_client: AsyncMock) -> ClozeGenerator:
-    """Create a ClozeGenerator with mock LLM client."""
-    from medanki.generation.cloze import ClozeGenerator
-
+    """Create a ClozeGenerator backed by this test's mock LLM client."""
     return ClozeGenerator(llm_client=mock_llm_client)
 
 
@@ -139,7 +180,9 @@ class TestClozeCardGeneration:
         self, cloze_generator: ClozeGenerator, sample_classified_chunk: MockClassifiedChunk
     ) -> None:
         """Generation returns list of ClozeCard objects."""
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
         assert isinstance(cards, list)
         assert len(cards) > 0
@@ -161,7 +204,11 @@ class TestClozeCardGeneration:
             {"text": "Card {{c1::three}}.", "tags": []},
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk, count=3)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text,
+            source_chunk_id=sample_classified_chunk.id,
+            num_cards=3,
+        )
 
         assert len(cards) == 3
 
@@ -170,33 +217,31 @@ class TestClozeCardGeneration:
         self, cloze_generator: ClozeGenerator, sample_classified_chunk: MockClassifiedChunk
     ) -> None:
         """All generated cards have valid {{c1::...}} syntax."""
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        cloze_pattern = re.compile(r"\{\{c(\d+)::([^}]+)\}\}")
-        for card in cards:
-            matches = cloze_pattern.findall(card.text)
-            assert len(matches) > 0, f"Card missing cloze deletion: {card.text}"
+        assert all(_CLOZE_RE.search(card.text) for card in cards)
 
     @pytest.mark.asyncio
     async def test_answers_are_short(
         self, cloze_generator: ClozeGenerator, sample_classified_chunk: MockClassifiedChunk
     ) -> None:
         """Cloze answers are 1-4 words."""
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        cloze_pattern = re.compile(r"\{\{c\d+::([^}]+)\}\}")
-        for card in cards:
-            answers = cloze_pattern.findall(card.text)
-            for answer in answers:
-                word_count = len(answer.strip().split())
-                assert 1 <= word_count <= 4, f"Answer '{answer}' has {word_count} words"
+        assert all(1 <= len(answer.split()) <= 4 for answer in _iter_answers(cards))
 
     @pytest.mark.asyncio
     async def test_cards_include_source_chunk_id(
         self, cloze_generator: ClozeGenerator, sample_classified_chunk: MockClassifiedChunk
     ) -> None:
         """Cards track provenance via source_chunk_id."""
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
         for card in cards:
             assert card.source_chunk_id == sample_classified_chunk.id
@@ -206,7 +251,9 @@ class TestClozeCardGeneration:
         self, cloze_generator: ClozeGenerator, sample_classified_chunk: MockClassifiedChunk
     ) -> None:
         """Cards have topic_id attribute."""
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
         for card in cards:
             assert hasattr(card, "topic_id")
@@ -229,13 +276,13 @@ class TestClozeContentQuality:
             {"text": "{{c1::ATP}} is produced in mitochondria.", "tags": []},
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
         # Check that key medical concepts are included in the cards
-        all_text = " ".join(card.text for card in cards)
-        assert any(
-            concept in all_text.lower() for concept in ["mitochondria", "atp", "krebs", "oxidative"]
-        )
+        joined = " ".join(card.text for card in cards).lower()
+        assert any(concept in joined for concept in ["mitochondria", "atp", "krebs", "oxidative"])
 
     @pytest.mark.asyncio
     async def test_avoids_trivial_deletions(
@@ -252,31 +299,15 @@ class TestClozeContentQuality:
             {"text": "ATP {{c1::is}} important.", "tags": []},  # Bad - trivial
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
-
-        cloze_pattern = re.compile(r"\{\{c\d+::([^}]+)\}\}")
-        trivial_words = {
-            "the",
-            "a",
-            "an",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "of",
-            "to",
-            "and",
-            "or",
-        }
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        for card in cards:
-            answers = cloze_pattern.findall(card.text)
-            for answer in answers:
-                # Single word answers should not be trivial
-                if len(answer.split()) == 1:
-                    assert answer.lower() not in trivial_words, f"Trivial deletion: {answer}"
+        # Single word answers should not be trivial
+        assert not any(
+            len(answer.split()) == 1 and answer.lower() in _TRIVIAL_WORDS
+            for answer in _iter_answers(cards)
+        )
 
     @pytest.mark.asyncio
     async def test_context_is_self_contained(
@@ -293,7 +324,9 @@ class TestClozeContentQuality:
             },
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
         for card in cards:
             # Card should have enough context (minimum length)
@@ -315,11 +348,12 @@ class TestClozeContentQuality:
             },
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        cloze_pattern = re.compile(r"\{\{c(\d+)::([^}]+)\}\}")
         multi_deletion_card = cards[0]
-        matches = cloze_pattern.findall(multi_deletion_card.text)
+        matches = _CLOZE_RE.findall(multi_deletion_card.text)
 
         assert len(matches) >= 2, "Card should have multiple deletions"
         indices = [int(m[0]) for m in matches]
@@ -348,10 +382,12 @@ class TestTopicSpecificGeneration:
             },
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_pharmacology_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_pharmacology_chunk.text, source_chunk_id=sample_pharmacology_chunk.id
+        )
 
-        all_text = " ".join(card.text.lower() for card in cards)
-        assert "biguanide" in all_text, "Pharmacology card should include drug class"
+        joined = " ".join(card.text for card in cards).lower()
+        assert "biguanide" in joined, "Pharmacology card should include drug class"
 
     @pytest.mark.asyncio
     async def test_anatomy_includes_location(
@@ -372,11 +408,13 @@ class TestTopicSpecificGeneration:
             },
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_anatomy_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_anatomy_chunk.text, source_chunk_id=sample_anatomy_chunk.id
+        )
 
-        all_text = " ".join(card.text.lower() for card in cards)
+        joined = " ".join(card.text for card in cards).lower()
         location_terms = ["anterior", "left ventricle", "groove", "coronary", "interventricular"]
-        has_location = any(term in all_text for term in location_terms)
+        has_location = any(term in joined for term in location_terms)
         assert has_location, "Anatomy card should include location context"
 
     @pytest.mark.asyncio
@@ -398,11 +436,13 @@ class TestTopicSpecificGeneration:
             },
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_biochemistry_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_biochemistry_chunk.text, source_chunk_id=sample_biochemistry_chunk.id
+        )
 
-        all_text = " ".join(card.text.lower() for card in cards)
+        joined = " ".join(card.text for card in cards).lower()
         pathway_terms = ["glycolysis", "pathway", "enzyme", "phosphate"]
-        has_pathway = any(term in all_text for term in pathway_terms)
+        has_pathway = any(term in joined for term in pathway_terms)
         assert has_pathway, "Biochemistry card should include pathway context"
 
 
@@ -410,63 +450,52 @@ class TestClozeGeneratorValidation:
     """Tests for cloze generator validation and error handling."""
 
     @pytest.mark.asyncio
-    async def test_filters_invalid_cloze_syntax(
-        self,
-        cloze_generator: ClozeGenerator,
-        sample_classified_chunk: MockClassifiedChunk,
-        mock_llm_client: AsyncMock,
-    ) -> None:
-        """Generator filters out cards with invalid cloze syntax."""
-        mock_llm_client.generate_cloze_cards.return_value = [
-            {"text": "This card has no deletions.", "tags": []},  # Invalid
-            {"text": "The {{c1::mitochondria}} produces ATP.", "tags": []},  # Valid
-            {"text": "Bad syntax {{c1:missing closing}}", "tags": []},  # Invalid
-        ]
-
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
-
-        # Should only include valid cards
-        assert len(cards) == 1
-        assert "mitochondria" in cards[0].text
-
-    @pytest.mark.asyncio
-    async def test_filters_long_answers(
-        self,
-        cloze_generator: ClozeGenerator,
-        sample_classified_chunk: MockClassifiedChunk,
-        mock_llm_client: AsyncMock,
-    ) -> None:
-        """Generator filters out cards with answers exceeding 4 words."""
-        mock_llm_client.generate_cloze_cards.return_value = [
-            {
-                "text": "The {{c1::this answer is way too long for cloze}} is complex.",
-                "tags": [],
-            },
-            {"text": "The {{c1::mitochondria}} produces ATP.", "tags": []},
-        ]
-
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
-
-        # Should filter out the card with long answer
-        cloze_pattern = re.compile(r"\{\{c\d+::([^}]+)\}\}")
-        for card in cards:
-            answers = cloze_pattern.findall(card.text)
-            for answer in answers:
-                assert len(answer.split()) <= 4
-
-    @pytest.mark.asyncio
-    async def test_handles_empty_llm_response(
+    @pytest.mark.parametrize(
+        ("llm_response", "expected_count", "check"),
+        [
+            pytest.param(
+                [
+                    {"text": "This card has no deletions.", "tags": []},  # Invalid
+                    {"text": "The {{c1::mitochondria}} produces ATP.", "tags": []},  # Valid
+                    {"text": "Bad syntax {{c1:missing closing}}", "tags": []},  # Invalid
+                ],
+                1,
+                lambda cards: "mitochondria" in cards[0].text,
+                id="filters_invalid_cloze_syntax",
+            ),
+            pytest.param(
+                [
+                    {
+                        "text": "The {{c1::this answer is way too long for cloze}} is complex.",
+                        "tags": [],
+                    },
+                    {"text": "The {{c1::mitochondria}} produces ATP.", "tags": []},
+                ],
+                1,
+                lambda cards: all(len(answer.split()) <= 4 for answer in _iter_answers(cards)),
+                id="filters_long_answers",
+            ),
+            pytest.param([], 0, lambda cards: cards == [], id="handles_empty_llm_response"),
+        ],
+    )
+    async def test_validation_cases(
         self,
         cloze_generator: ClozeGenerator,
         sample_classified_chunk: MockClassifiedChunk,
         mock_llm_client: AsyncMock,
+        llm_response: list[dict[str, Any]],
+        expected_count: int,
+        check: Callable[[list[Any]], bool],
     ) -> None:
-        """Generator handles empty LLM response gracefully."""
-        mock_llm_client.generate_cloze_cards.return_value = []
+        """Generator drops invalid LLM output and keeps only well-formed cards."""
+        mock_llm_client.generate_cloze_cards.return_value = llm_response
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        assert cards == []
+        assert len(cards) == expected_count
+        assert check(cards)
 
     @pytest.mark.asyncio
     async def test_handles_llm_error(
@@ -479,7 +508,9 @@ class TestClozeGeneratorValidation:
         mock_llm_client.generate_cloze_cards.side_effect = Exception("LLM API error")
 
         with pytest.raises(Exception) as exc_info:
-            await generate_from_chunk(cloze_generator, sample_classified_chunk)
+            await cloze_generator.generate(
+                content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+            )
 
         assert "LLM" in str(exc_info.value) or "error" in str(exc_info.value).lower()
 
@@ -499,12 +530,13 @@ class TestClozeCardUniqueness:
             {"text": "The {{c1::mitochondria}} is the powerhouse of the cell.", "tags": []},
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        for card in cards:
-            cloze_pattern = re.compile(r"\{\{c\d+::([^}]+)\}\}")
-            matches = cloze_pattern.findall(card.text)
-            assert len(matches) <= 3, "Card should test a limited number of facts"
+        assert all(len(_ANSWER_RE.findall(card.text)) <= 3 for card in cards), (
+            "Card should test a limited number of facts"
+        )
 
     @pytest.mark.asyncio
     async def test_cloze_cards_are_unique(
@@ -520,7 +552,9 @@ class TestClozeCardUniqueness:
             {"text": "The {{c1::Krebs cycle}} generates electron carriers.", "tags": []},
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
         card_texts = [card.text for card in cards]
         assert len(card_texts) == len(set(card_texts)), "All cards should be unique"
@@ -543,7 +577,9 @@ class TestAntiTriviaPatterns:
             {"text": "The heart has {{c1::four}} chambers.", "tags": []},
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
         for card in cards:
             assert "et al" not in card.text.lower()
@@ -563,13 +599,14 @@ class TestAntiTriviaPatterns:
             {"text": "Glucose is {{c1::phosphorylated}} in the first step.", "tags": []},
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        for card in cards:
-            cloze_pattern = re.compile(r"\{\{c\d+::([^}]+)\}\}")
-            answers = cloze_pattern.findall(card.text)
-            for answer in answers:
-                assert not re.match(r"(?:Figure|Table|Fig\.?)\s*\d+", answer, re.IGNORECASE)
+        assert not any(
+            re.match(r"(?:Figure|Table|Fig\.?)\s*\d+", answer, re.IGNORECASE)
+            for answer in _iter_answers(cards)
+        )
 
     @pytest.mark.asyncio
     async def test_filters_year_only_deletions(
@@ -585,13 +622,11 @@ class TestAntiTriviaPatterns:
             {"text": "Penicillin inhibits {{c1::cell wall}} synthesis.", "tags": []},
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        cloze_pattern = re.compile(r"\{\{c\d+::([^}]+)\}\}")
-        for card in cards:
-            answers = cloze_pattern.findall(card.text)
-            for answer in answers:
-                assert not re.match(r"^\d{4}$", answer.strip())
+        assert not any(re.match(r"^\d{4}$", answer.strip()) for answer in _iter_answers(cards))
 
     @pytest.mark.asyncio
     async def test_filters_journal_names(
@@ -607,14 +642,11 @@ class TestAntiTriviaPatterns:
             {"text": "Beta-blockers reduce {{c1::mortality}} in heart failure.", "tags": []},
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        journal_names = {"nejm", "lancet", "jama", "bmj", "nature", "science", "cell"}
-        cloze_pattern = re.compile(r"\{\{c\d+::([^}]+)\}\}")
-        for card in cards:
-            answers = cloze_pattern.findall(card.text)
-            for answer in answers:
-                assert answer.strip().lower() not in journal_names
+        assert not any(answer.strip().lower() in _JOURNAL_NAMES for answer in _iter_answers(cards))
 
     @pytest.mark.asyncio
     async def test_filters_doi_pmid_references(
@@ -630,11 +662,10 @@ class TestAntiTriviaPatterns:
             {"text": "ACE inhibitors block {{c1::angiotensin converting enzyme}}.", "tags": []},
         ]
 
-        cards = await generate_from_chunk(cloze_generator, sample_classified_chunk)
+        cards = await cloze_generator.generate(
+            content=sample_classified_chunk.text, source_chunk_id=sample_classified_chunk.id
+        )
 
-        cloze_pattern = re.compile(r"\{\{c\d+::([^}]+)\}\}")
-        for card in cards:
-            answers = cloze_pattern.findall(card.text)
-            for answer in answers:
-                assert "pmid" not in answer.lower()
-                assert not re.match(r"10\.\d+/", answer)
+        for answer in _iter_answers(cards):
+            assert "pmid" not in answer.lower()
+            assert not re.match(r"10\.\d+/", answer)
@@ -1,11 +1,16 @@
+import json
+from dataclasses import replace
 from unittest.mock import AsyncMock, MagicMock
 
+import numpy as np
 import pytest
 
 from medanki.generation.deduplicator import (
     DeduplicationResult,
     Deduplicator,
     DuplicateStatus,
+    EmbeddingStore,
+    QuantizedEmbeddingStore,
 )
 from medanki.models.cards import ClozeCard
 
@@ -43,17 +48,37 @@ class TestExactDuplicateDetection:
 
         assert hash1 == hash2
 
+    def test_deduplicate_keeps_first_occurrence(self):
+        deduplicator = Deduplicator()
+        first = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source A",
+        )
+        other = ClozeCard(
+            text="{{c1::ATP}} is the energy currency of the cell.", source_chunk_id="Source A"
+        )
+        repeat = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source B",
+        )
+
+        unique = deduplicator.deduplicate([first, other, repeat])
+
+        assert unique == [first, other]
+        assert unique[0] is first
+
 
 class TestSemanticDuplicateDetection:
     @pytest.fixture
     def mock_embedding_client(self):
         client = MagicMock()
         client.embed = AsyncMock()
+        client.embed_batch = AsyncMock()
         return client
 
     @pytest.mark.asyncio
     async def test_detects_semantic_duplicate(self, mock_embedding_client):
-        mock_embedding_client.embed.side_effect = [
+        mock_embedding_client.embed_batch.return_value = [
             [0.9, 0.1, 0.05],
             [0.91, 0.09, 0.04],
         ]
@@ -72,10 +97,11 @@ class TestSemanticDuplicateDetection:
 
         assert result.is_duplicate is True
         assert result.status == DuplicateStatus.SEMANTIC
+        mock_embedding_client.embed_batch.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_similarity_threshold(self, mock_embedding_client):
-        mock_embedding_client.embed.side_effect = [
+        mock_embedding_client.embed_batch.return_value = [
             [0.9, 0.1, 0.05],
             [0.92, 0.08, 0.03],
         ]
@@ -98,7 +124,7 @@ class TestSemanticDuplicateDetection:
 
     @pytest.mark.asyncio
     async def test_different_cards_pass(self, mock_embedding_client):
-        mock_embedding_client.embed.side_effect = [
+        mock_embedding_client.embed_batch.return_value = [
             [0.9, 0.1, 0.0],
             [0.1, 0.8, 0.1],
         ]
@@ -118,6 +144,52 @@ class TestSemanticDuplicateDetection:
 
         assert result.is_duplicate is False
 
+    @pytest.mark.asyncio
+    async def test_zero_embedding_is_not_duplicate(self, mock_embedding_client):
+        mock_embedding_client.embed_batch.return_value = [
+            [0.0, 0.0, 0.0],
+            [0.9, 0.1, 0.05],
+        ]
+
+        deduplicator = Deduplicator(embedding_client=mock_embedding_client)
+        card1 = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source A",
+        )
+        card2 = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source B",
+        )
+
+        result = await deduplicator.check_semantic_duplicate(card1, [card2])
+
+        assert result.is_duplicate is False
+        assert result.similarity_score == 0.0
+
+    @pytest.mark.asyncio
+    async def test_mismatched_dimension_scores_zero(self, mock_embedding_client):
+        mock_embedding_client.embed_batch.return_value = [
+            [0.9, 0.1, 0.05],
+            [0.9, 0.1],
+            [0.91, 0.09, 0.04],
+        ]
+
+        deduplicator = Deduplicator(embedding_client=mock_embedding_client)
+        card = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source A",
+        )
+        truncated = ClozeCard(text="{{c1::ATP}} is made in mitochondria.", source_chunk_id="B")
+        similar = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source C",
+        )
+
+        result = await deduplicator.check_semantic_duplicate(card, [truncated, similar])
+
+        assert result.status == DuplicateStatus.SEMANTIC
+        assert result.duplicate_of is similar
+
 
 class TestCrossSessionDeduplication:
     @pytest.fixture
@@ -131,6 +203,7 @@ class TestCrossSessionDeduplication:
     def mock_embedding_client(self):
         client = MagicMock()
         client.embed = AsyncMock()
+        client.embed_batch = AsyncMock()
         return client
 
     @pytest.mark.asyncio
@@ -150,7 +223,356 @@ class TestCrossSessionDeduplication:
         result = await deduplicator.check_against_existing(new_card)
 
         assert result.is_duplicate is True
+        assert result.status == DuplicateStatus.EXACT
+        assert result.duplicate_of is existing_card
         mock_db.get_existing_cards.assert_called_once()
+        mock_embedding_client.embed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_uses_stored_embeddings_across_checks(self, mock_db, mock_embedding_client):
+        existing_card = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source A",
+        )
+        mock_db.get_existing_cards.return_value = [existing_card]
+        mock_db.get_card_embeddings.return_value = {existing_card.id: [0.9, 0.1, 0.05]}
+        mock_embedding_client.embed.side_effect = [
+            [0.91, 0.09, 0.04],
+            [0.1, 0.8, 0.1],
+        ]
+
+        deduplicator = Deduplicator(embedding_client=mock_embedding_client, database=mock_db)
+        similar_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source B",
+        )
+        different_card = ClozeCard(
+            text="{{c1::Hypertension}} is defined as BP > 130/80.", source_chunk_id="Source C"
+        )
+
+        similar = await deduplicator.check_against_existing(similar_card)
+        different = await deduplicator.check_against_existing(different_card)
+
+        assert similar.status == DuplicateStatus.SEMANTIC
+        assert similar.duplicate_of is existing_card
+        assert different.is_duplicate is False
+        assert mock_embedding_client.embed.call_count == 2
+        assert mock_db.get_existing_cards.call_count == 2
+        mock_db.get_card_embeddings.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_skips_stored_embeddings_with_wrong_dimension(
+        self, tmp_path, mock_db, mock_embedding_client
+    ):
+        existing_cards = [
+            ClozeCard(text="{{c1::ATP}} is made in mitochondria.", source_chunk_id="Source A"),
+            ClozeCard(
+                text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+                source_chunk_id="Source A",
+            ),
+            ClozeCard(
+                text="{{c1::Hypertension}} is defined as BP > 130/80.", source_chunk_id="Source A"
+            ),
+        ]
+        mock_db.get_existing_cards.return_value = existing_cards
+        mock_db.get_card_embeddings.return_value = {
+            existing_cards[0].id: [0.9, 0.1],
+            existing_cards[1].id: [0.9, 0.1, 0.05],
+            existing_cards[2].id: [0.1, 0.8, 0.1],
+        }
+        mock_embedding_client.embed.return_value = [0.91, 0.09, 0.04]
+
+        deduplicator = Deduplicator(
+            embedding_client=mock_embedding_client,
+            database=mock_db,
+            embedding_cache=tmp_path / "embeddings.npy",
+        )
+        new_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source B",
+        )
+
+        result = await deduplicator.check_against_existing(new_card)
+
+        assert result.status == DuplicateStatus.SEMANTIC
+        assert result.duplicate_of is existing_cards[1]
+
+    @pytest.mark.asyncio
+    async def test_quantized_store_detects_semantic_duplicate(self, mock_db, mock_embedding_client):
+        existing_card = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source A",
+        )
+        mock_db.get_existing_cards.return_value = [existing_card]
+        mock_db.get_card_embeddings.return_value = {existing_card.id: [0.9, 0.1, 0.05]}
+        mock_embedding_client.embed.return_value = [0.91, 0.09, 0.04]
+
+        deduplicator = Deduplicator(
+            embedding_client=mock_embedding_client, database=mock_db, quantize=True
+        )
+        new_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source B",
+        )
+
+        result = await deduplicator.check_against_existing(new_card)
+
+        assert result.status == DuplicateStatus.SEMANTIC
+        assert result.duplicate_of is existing_card
+
+    @pytest.mark.asyncio
+    async def test_fast_reject_matches_full_scan(self, mock_db, mock_embedding_client):
+        rng = np.random.default_rng(1)
+        existing_cards = [
+            ClozeCard(text=f"Fact {{{{c1::{i}}}}}.", source_chunk_id="Source A") for i in range(5)
+        ]
+        embeddings = rng.standard_normal((5, 128))
+        mock_db.get_existing_cards.return_value = existing_cards
+        mock_db.get_card_embeddings.return_value = {
+            card.id: vector.tolist()
+            for card, vector in zip(existing_cards, embeddings, strict=True)
+        }
+        mock_embedding_client.embed.return_value = (embeddings[3] + 0.01).tolist()
+
+        deduplicator = Deduplicator(
+            embedding_client=mock_embedding_client, database=mock_db, fast_reject=True
+        )
+        new_card = ClozeCard(text="Fact {{c1::three}}.", source_chunk_id="Source B")
+
+        result = await deduplicator.check_against_existing(new_card)
+
+        assert result.status == DuplicateStatus.SEMANTIC
+        assert result.duplicate_of is existing_cards[3]
+
+    @pytest.mark.asyncio
+    async def test_fast_reject_unique_score_covers_surviving_rows_only(
+        self, mock_db, mock_embedding_client
+    ):
+        basis = np.eye(128)
+        existing_cards = [
+            ClozeCard(text=f"Fact {{{{c1::{i}}}}}.", source_chunk_id="Source A") for i in range(2)
+        ]
+        mock_db.get_existing_cards.return_value = existing_cards
+        mock_db.get_card_embeddings.return_value = {
+            card.id: vector.tolist() for card, vector in zip(existing_cards, basis[:2], strict=True)
+        }
+        mock_embedding_client.embed.return_value = (0.6 * basis[0] + 0.8 * basis[100]).tolist()
+        new_card = ClozeCard(text="Fact {{c1::new}}.", source_chunk_id="Source B")
+
+        results = {}
+        for fast_reject in [False, True]:
+            deduplicator = Deduplicator(
+                embedding_client=mock_embedding_client, database=mock_db, fast_reject=fast_reject
+            )
+            results[fast_reject] = await deduplicator.check_against_existing(new_card)
+
+        assert results[False].status == results[True].status == DuplicateStatus.UNIQUE
+        assert results[False].similarity_score == pytest.approx(0.6)
+        assert results[True].similarity_score == 0.0
+
+    @pytest.mark.asyncio
+    async def test_reuses_embedding_cache_across_sessions(
+        self, tmp_path, mock_db, mock_embedding_client
+    ):
+        existing_card = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source A",
+        )
+        mock_db.get_existing_cards.return_value = [existing_card]
+        mock_db.get_card_embeddings.return_value = {existing_card.id: [0.9, 0.1, 0.05]}
+        mock_embedding_client.embed.return_value = [0.91, 0.09, 0.04]
+        new_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source B",
+        )
+        cache = tmp_path / "embeddings.npy"
+
+        first = Deduplicator(
+            embedding_client=mock_embedding_client, database=mock_db, embedding_cache=cache
+        )
+        await first.check_against_existing(new_card)
+        second = Deduplicator(
+            embedding_client=mock_embedding_client, database=mock_db, embedding_cache=cache
+        )
+        result = await second.check_against_existing(new_card)
+
+        assert cache.exists()
+        assert result.status == DuplicateStatus.SEMANTIC
+        assert result.duplicate_of is existing_card
+        mock_db.get_card_embeddings.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_quantized_cache_keeps_int8_codes(self, tmp_path, mock_db, mock_embedding_client):
+        existing_card = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source A",
+        )
+        mock_db.get_existing_cards.return_value = [existing_card]
+        mock_db.get_card_embeddings.return_value = {existing_card.id: [0.9, 0.1, 0.05]}
+        mock_embedding_client.embed.return_value = [0.91, 0.09, 0.04]
+        new_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source B",
+        )
+        cache = tmp_path / "embeddings.npy"
+
+        for quantize in [False, True, True]:
+            deduplicator = Deduplicator(
+                embedding_client=mock_embedding_client,
+                database=mock_db,
+                quantize=quantize,
+                embedding_cache=cache,
+            )
+            result = await deduplicator.check_against_existing(new_card)
+
+        assert result.status == DuplicateStatus.SEMANTIC
+        assert np.load(cache).dtype == np.int8
+        assert mock_db.get_card_embeddings.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_embedding_cache_ignores_edited_cards(
+        self, tmp_path, mock_db, mock_embedding_client
+    ):
+        card = ClozeCard(
+            text="{{c1::Hypertension}} is defined as BP > 130/80.", source_chunk_id="Source A"
+        )
+        edited = replace(card, text="The {{c1::mitochondria}} is the powerhouse of the cell.")
+        mock_db.get_card_embeddings.side_effect = [
+            {card.id: [0.1, 0.8, 0.1]},
+            {edited.id: [0.9, 0.1, 0.05]},
+        ]
+        mock_embedding_client.embed.return_value = [0.91, 0.09, 0.04]
+        new_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source B",
+        )
+        cache = tmp_path / "embeddings.npy"
+
+        mock_db.get_existing_cards.return_value = [card]
+        first = Deduplicator(
+            embedding_client=mock_embedding_client, database=mock_db, embedding_cache=cache
+        )
+        before = await first.check_against_existing(new_card)
+        mock_db.get_existing_cards.return_value = [edited]
+        second = Deduplicator(
+            embedding_client=mock_embedding_client, database=mock_db, embedding_cache=cache
+        )
+        after = await second.check_against_existing(new_card)
+
+        assert before.is_duplicate is False
+        assert after.status == DuplicateStatus.SEMANTIC
+        assert after.duplicate_of is edited
+
+    @pytest.mark.asyncio
+    async def test_embedding_cache_ignores_other_models(
+        self, tmp_path, mock_db, mock_embedding_client
+    ):
+        existing_card = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source A",
+        )
+        mock_db.get_existing_cards.return_value = [existing_card]
+        mock_db.get_card_embeddings.return_value = {existing_card.id: [0.9, 0.1, 0.05]}
+        mock_embedding_client.embed.return_value = [0.91, 0.09, 0.04]
+        new_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source B",
+        )
+        cache = tmp_path / "embeddings.npy"
+
+        for model_name in ["model-a", "model-b"]:
+            mock_embedding_client.model_name = model_name
+            deduplicator = Deduplicator(
+                embedding_client=mock_embedding_client, database=mock_db, embedding_cache=cache
+            )
+            await deduplicator.check_against_existing(new_card)
+
+        assert mock_db.get_card_embeddings.call_count == 2
+        assert json.loads(cache.with_suffix(".meta.json").read_text())["model"] == "model-b"
+
+    @pytest.mark.asyncio
+    async def test_embedding_cache_without_metadata_is_rebuilt(
+        self, tmp_path, mock_db, mock_embedding_client
+    ):
+        existing_card = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source A",
+        )
+        mock_db.get_existing_cards.return_value = [existing_card]
+        mock_db.get_card_embeddings.return_value = {existing_card.id: [0.9, 0.1, 0.05]}
+        mock_embedding_client.embed.return_value = [0.91, 0.09, 0.04]
+        cache = tmp_path / "embeddings.npy"
+        np.save(cache, np.array([[0.0, 1.0, 0.0]], dtype=np.float32))
+        new_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source B",
+        )
+
+        deduplicator = Deduplicator(
+            embedding_client=mock_embedding_client, database=mock_db, embedding_cache=cache
+        )
+        result = await deduplicator.check_against_existing(new_card)
+
+        assert result.status == DuplicateStatus.SEMANTIC
+        assert cache.with_suffix(".meta.json").exists()
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "embeddings.meta.json",
+            "embeddings.npy",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_indexes_cards_saved_after_first_check(self, mock_db, mock_embedding_client):
+        existing_card = ClozeCard(
+            text="{{c1::Hypertension}} is defined as BP > 130/80.", source_chunk_id="Source A"
+        )
+        saved_card = ClozeCard(
+            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+            source_chunk_id="Source B",
+        )
+        mock_db.get_existing_cards.side_effect = [[existing_card], [existing_card, saved_card]]
+        mock_db.get_card_embeddings.return_value = {
+            existing_card.id: [0.1, 0.8, 0.1],
+            saved_card.id: [0.9, 0.1, 0.05],
+        }
+        mock_embedding_client.embed.return_value = [0.91, 0.09, 0.04]
+
+        deduplicator = Deduplicator(embedding_client=mock_embedding_client, database=mock_db)
+        new_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source C",
+        )
+        before = await deduplicator.check_against_existing(new_card)
+        after = await deduplicator.check_against_existing(new_card)
+
+        assert before.is_duplicate is False
+        assert after.status == DuplicateStatus.SEMANTIC
+        assert after.duplicate_of is saved_card
+        assert mock_db.get_card_embeddings.call_args_list[-1].args == ([saved_card],)
+
+    @pytest.mark.asyncio
+    async def test_reindexes_edited_cards(self, mock_db, mock_embedding_client):
+        card = ClozeCard(
+            text="{{c1::Hypertension}} is defined as BP > 130/80.", source_chunk_id="Source A"
+        )
+        edited = replace(card, text="The {{c1::mitochondria}} is the powerhouse of the cell.")
+        mock_db.get_existing_cards.side_effect = [[card], [edited]]
+        mock_db.get_card_embeddings.side_effect = [
+            {card.id: [0.1, 0.8, 0.1]},
+            {edited.id: [0.9, 0.1, 0.05]},
+        ]
+        mock_embedding_client.embed.return_value = [0.91, 0.09, 0.04]
+
+        deduplicator = Deduplicator(embedding_client=mock_embedding_client, database=mock_db)
+        new_card = ClozeCard(
+            text="The {{c1::mitochondrion}} is the cell's power generator.",
+            source_chunk_id="Source C",
+        )
+        before = await deduplicator.check_against_existing(new_card)
+        after = await deduplicator.check_against_existing(new_card)
+
+        assert before.is_duplicate is False
+        assert after.status == DuplicateStatus.SEMANTIC
+        assert after.duplicate_of is edited
 
     def test_marks_vs_removes(self, mock_db, mock_embedding_client):
         deduplicator = Deduplicator(embedding_client=mock_embedding_client, database=mock_db)
@@ -168,3 +590,120 @@ class TestCrossSessionDeduplication:
 
         removed = deduplicator.handle_duplicate(card, duplicate_result, action="remove")
         assert removed.card is None
+
+
+class TestEmbeddingStore:
+    def test_grows_past_initial_capacity(self):
+        store = EmbeddingStore(capacity=2)
+        vectors = [[3.0, 4.0], [0.0, 2.0], [1.0, 0.0], [0.0, 0.0], [5.0, 12.0]]
+
+        for vector in vectors:
+            store.append(vector)
+
+        assert len(store) == len(vectors)
+        assert store.matrix.shape == (5, 2)
+        assert store.matrix.dtype == np.float32
+        np.testing.assert_allclose(store.matrix[0], [0.6, 0.8], rtol=1e-6)
+        np.testing.assert_allclose(store.matrix[3], [0.0, 0.0])
+        np.testing.assert_allclose(store.matrix[4], [5 / 13, 12 / 13], rtol=1e-6)
+
+    def test_fast_reject_skips_rows_bounded_below_threshold(self):
+        basis = np.eye(128, dtype=np.float32)
+        store = EmbeddingStore()
+        for vector in basis[:8]:
+            store.append(vector)
+
+        keep, similarities = store.candidates(basis[0], 0.9)
+
+        np.testing.assert_array_equal(keep, [0])
+        assert similarities[0] == pytest.approx(1.0)
+
+    def test_fast_reject_keeps_every_row_above_threshold(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((50, 128)).astype(np.float32)
+        query = vectors[7] / np.linalg.norm(vectors[7])
+        store = EmbeddingStore()
+        for vector in vectors:
+            store.append(vector)
+
+        exact = store.similarities(query)
+        keep, similarities = store.candidates(query, 0.5)
+
+        assert set(np.flatnonzero(exact >= 0.5)) <= set(keep)
+        np.testing.assert_allclose(similarities, exact[keep], atol=1e-5)
+
+    def test_load_memory_maps_saved_rows(self, tmp_path):
+        path = tmp_path / "rows.npy"
+        np.save(path, np.array([[0.6, 0.8], [1.0, 0.0]], dtype=np.float32))
+
+        store = EmbeddingStore.load(path)
+        store.append([0.0, 3.0])
+
+        assert len(store) == 3
+        np.testing.assert_allclose(store.matrix, [[0.6, 0.8], [1.0, 0.0], [0.0, 1.0]])
+
+    def test_empty_store_has_no_rows(self):
+        store = EmbeddingStore()
+
+        assert len(store) == 0
+        assert store.matrix.shape[0] == 0
+
+
+class TestQuantizedEmbeddingStore:
+    def test_similarities_match_float_store(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((10, 16)).astype(np.float32)
+        query = vectors[3] / np.linalg.norm(vectors[3])
+        exact = EmbeddingStore(capacity=4)
+        quantized = QuantizedEmbeddingStore(capacity=4)
+
+        for vector in vectors:
+            exact.append(vector)
+            quantized.append(vector)
+
+        assert len(quantized) == len(vectors)
+        np.testing.assert_allclose(
+            quantized.similarities(query), exact.similarities(query), atol=1e-2
+        )
+
+    def test_load_memory_maps_saved_codes(self, tmp_path):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((6, 96)).astype(np.float32)
+        query = vectors[2] / np.linalg.norm(vectors[2])
+        store = QuantizedEmbeddingStore()
+        for vector in vectors:
+            store.append(vector)
+        path = tmp_path / "codes.npy"
+
+        store.save(path)
+        loaded = QuantizedEmbeddingStore.load(path)
+        loaded.append(vectors[0])
+
+        assert len(loaded) == 7
+        np.testing.assert_allclose(
+            loaded.similarities(query)[:6], store.similarities(query), rtol=1e-6
+        )
+        keep, _ = loaded.candidates(query, 0.9)
+        assert 2 in keep
+
+    def test_dimension_mismatch_scores_zero(self):
+        store = QuantizedEmbeddingStore()
+        store.append([1.0, 0.0, 0.0])
+
+        similarities = store.similarities(np.array([1.0, 0.0], dtype=np.float32))
+
+        np.testing.assert_array_equal(similarities, [0.0])
+
+    def test_candidates_keep_near_threshold_duplicate(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((20, 128)).astype(np.float32)
+        query = vectors[5] / np.linalg.norm(vectors[5])
+        store = QuantizedEmbeddingStore()
+        for vector in vectors:
+            store.append(vector)
+        threshold = float(store.similarities(query)[5])
+
+        keep, similarities = store.candidates(query, threshold)
+
+        assert 5 in keep
+        assert similarities[list(keep).index(5)] == pytest.approx(threshold)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import Mock
 from uuid import uuid4
 
 import pytest
@@ -16,7 +19,96 @@ from medanki.models.cards import ClozeCard, VignetteCard, VignetteOption
 from medanki.services.protocols import Chunk, ChunkType, Document, DocumentType
 
 if TYPE_CHECKING:
-    pass
+    from collections.abc import Sequence
+    from uuid import UUID
+
+
+class StubClozeGen:
+    def __init__(self) -> None:
+        self.cards: list[ClozeCard] = []
+
+    async def generate(
+        self,
+        content: str,
+        source_chunk_id: UUID,
+        topic_id: str | None = None,
+        num_cards: int = 3,
+    ) -> list[ClozeCard]:
+        return list(self.cards)
+
+
+class StubVignetteGen:
+    def __init__(self) -> None:
+        self.cards: list[VignetteCard] = []
+
+    async def generate(
+        self,
+        content: str,
+        source_chunk_id: UUID,
+        topic_id: str | None = None,
+        num_cards: int = 1,
+    ) -> list[VignetteCard]:
+        return list(self.cards)
+
+
+class StubValidator:
+    async def validate(
+        self, card: ClozeCard | VignetteCard, source_content: str | None = None
+    ) -> tuple[bool, list[str]]:
+        return (True, [])
+
+
+class StubDeduplicator:
+    def deduplicate(self, cards: list[ClozeCard | VignetteCard]) -> list[ClozeCard | VignetteCard]:
+        return cards
+
+
+class StubClassifier:
+    def __init__(self) -> None:
+        self.chunk_type = ChunkType.CONCEPT
+
+    async def classify_chunk(self, chunk: Chunk) -> ChunkType:
+        return self.chunk_type
+
+
+class StubBatchClassifier(StubClassifier):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[Sequence[Chunk]] = []
+        self.single_calls = 0
+
+    async def classify_chunk(self, chunk: Chunk) -> ChunkType:
+        self.single_calls += 1
+        return self.chunk_type
+
+    async def classify_chunks(self, chunks: Sequence[Chunk]) -> list[ChunkType]:
+        self.batches.append(chunks)
+        return [self.chunk_type] * len(chunks)
+
+
+class FailingBatchClassifier(StubBatchClassifier):
+    def __init__(self, error: Exception) -> None:
+        super().__init__()
+        self.error = error
+
+    async def classify_chunks(self, chunks: Sequence[Chunk]) -> list[ChunkType]:
+        raise self.error
+
+
+@pytest.fixture
+def stubs() -> SimpleNamespace:
+    return SimpleNamespace(
+        cloze_generator=StubClozeGen(),
+        vignette_generator=StubVignetteGen(),
+        validator=StubValidator(),
+        deduplicator=StubDeduplicator(),
+        classifier=StubClassifier(),
+    )
+
+
+@pytest.fixture
+def service(stubs: SimpleNamespace) -> GenerationService:
+    return GenerationService(**vars(stubs))
 
 
 def make_chunk(content: str = "Test content", chunk_type: ChunkType | None = None) -> Chunk:
@@ -58,66 +150,18 @@ def make_vignette_card(chunk: Chunk, topic_id: str | None = None) -> VignetteCar
 
 
 class TestOrchestration:
-    @pytest.fixture
-    def mock_cloze_generator(self) -> MagicMock:
-        gen = MagicMock()
-        gen.generate = AsyncMock(return_value=[])
-        return gen
-
-    @pytest.fixture
-    def mock_vignette_generator(self) -> MagicMock:
-        gen = MagicMock()
-        gen.generate = AsyncMock(return_value=[])
-        return gen
-
-    @pytest.fixture
-    def mock_validator(self) -> MagicMock:
-        validator = MagicMock()
-        validator.validate = AsyncMock(return_value=(True, []))
-        return validator
-
-    @pytest.fixture
-    def mock_deduplicator(self) -> MagicMock:
-        dedup = MagicMock()
-        dedup.deduplicate = MagicMock(side_effect=lambda cards: cards)
-        return dedup
-
-    @pytest.fixture
-    def mock_classifier(self) -> MagicMock:
-        classifier = MagicMock()
-        classifier.classify_chunk = AsyncMock(return_value=ChunkType.CONCEPT)
-        return classifier
-
-    @pytest.fixture
-    def service(
-        self,
-        mock_cloze_generator: MagicMock,
-        mock_vignette_generator: MagicMock,
-        mock_validator: MagicMock,
-        mock_deduplicator: MagicMock,
-        mock_classifier: MagicMock,
-    ) -> GenerationService:
-        return GenerationService(
-            cloze_generator=mock_cloze_generator,
-            vignette_generator=mock_vignette_generator,
-            validator=mock_validator,
-            deduplicator=mock_deduplicator,
-            classifier=mock_classifier,
-        )
-
     @pytest.mark.asyncio
     async def test_generate_cards_from_chunk(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
-        mock_vignette_generator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
         cloze = make_cloze_card(chunk)
         vignette = make_vignette_card(chunk)
 
-        mock_cloze_generator.generate.return_value = [cloze]
-        mock_vignette_generator.generate.return_value = [vignette]
+        stubs.cloze_generator.cards = [cloze]
+        stubs.vignette_generator.cards = [vignette]
 
         result = await service.generate_cards([chunk])
 
@@ -129,150 +173,146 @@ class TestOrchestration:
     async def test_respects_card_type_config(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
-        mock_vignette_generator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
         cloze = make_cloze_card(chunk)
-        mock_cloze_generator.generate.return_value = [cloze]
-        mock_vignette_generator.generate.return_value = [make_vignette_card(chunk)]
+        stubs.cloze_generator.cards = [cloze]
+        stubs.vignette_generator.cards = [make_vignette_card(chunk)]
+        service.vignette_generator = Mock(wraps=stubs.vignette_generator)
 
         config = GenerationConfig(enable_vignettes=False)
         result = await service.generate_cards([chunk], config=config)
 
-        mock_vignette_generator.generate.assert_not_called()
+        service.vignette_generator.generate.assert_not_called()
         assert all(isinstance(c, ClozeCard) for c in result.cards)
 
     @pytest.mark.asyncio
     async def test_respects_count_limits(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
         config = GenerationConfig(max_cloze_per_chunk=2, max_vignette_per_chunk=1)
+        service.cloze_generator = Mock(wraps=stubs.cloze_generator)
 
         await service.generate_cards([chunk], config=config)
 
-        call_kwargs = mock_cloze_generator.generate.call_args
+        call_kwargs = service.cloze_generator.generate.call_args
         assert call_kwargs.kwargs.get("num_cards") == 2 or call_kwargs[1].get("num_cards") == 2
 
     @pytest.mark.asyncio
     async def test_validates_all_cards(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
-        mock_validator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
         cards = [make_cloze_card(chunk) for _ in range(3)]
-        mock_cloze_generator.generate.return_value = cards
+        stubs.cloze_generator.cards = cards
+        service.validator = Mock(wraps=stubs.validator)
 
         await service.generate_cards([chunk])
 
-        assert mock_validator.validate.call_count >= len(cards)
+        assert service.validator.validate.call_count >= len(cards)
 
     @pytest.mark.asyncio
     async def test_deduplicates_cards(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
-        mock_deduplicator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
         cards = [make_cloze_card(chunk) for _ in range(3)]
-        mock_cloze_generator.generate.return_value = cards
+        stubs.cloze_generator.cards = cards
+        service.deduplicator = Mock(wraps=stubs.deduplicator)
 
         await service.generate_cards([chunk])
 
-        mock_deduplicator.deduplicate.assert_called_once()
+        service.deduplicator.deduplicate.assert_called_once()
 
 
 class TestPipeline:
-    @pytest.fixture
-    def mock_cloze_generator(self) -> MagicMock:
-        gen = MagicMock()
-        gen.generate = AsyncMock(return_value=[])
-        return gen
-
-    @pytest.fixture
-    def mock_vignette_generator(self) -> MagicMock:
-        gen = MagicMock()
-        gen.generate = AsyncMock(return_value=[])
-        return gen
-
-    @pytest.fixture
-    def mock_validator(self) -> MagicMock:
-        validator = MagicMock()
-        validator.validate = AsyncMock(return_value=(True, []))
-        return validator
-
-    @pytest.fixture
-    def mock_deduplicator(self) -> MagicMock:
-        dedup = MagicMock()
-        dedup.deduplicate = MagicMock(side_effect=lambda cards: cards)
-        return dedup
-
-    @pytest.fixture
-    def mock_classifier(self) -> MagicMock:
-        classifier = MagicMock()
-        classifier.classify_chunk = AsyncMock(return_value=ChunkType.CONCEPT)
-        return classifier
-
-    @pytest.fixture
-    def service(
-        self,
-        mock_cloze_generator: MagicMock,
-        mock_vignette_generator: MagicMock,
-        mock_validator: MagicMock,
-        mock_deduplicator: MagicMock,
-        mock_classifier: MagicMock,
-    ) -> GenerationService:
-        return GenerationService(
-            cloze_generator=mock_cloze_generator,
-            vignette_generator=mock_vignette_generator,
-            validator=mock_validator,
-            deduplicator=mock_deduplicator,
-            classifier=mock_classifier,
-        )
-
     @pytest.mark.asyncio
     async def test_classify_then_generate(
         self,
         service: GenerationService,
-        mock_classifier: MagicMock,
-        mock_cloze_generator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
-        mock_classifier.classify_chunk.return_value = ChunkType.CLINICAL_VIGNETTE
+        stubs.classifier.chunk_type = ChunkType.CLINICAL_VIGNETTE
+        service.classifier = Mock(wraps=stubs.classifier)
 
         await service.generate_cards([chunk])
 
-        mock_classifier.classify_chunk.assert_called_once_with(chunk)
+        service.classifier.classify_chunk.assert_called_once_with(chunk)
+
+    @pytest.mark.asyncio
+    async def test_batch_classifier_classifies_once(
+        self,
+        service: GenerationService,
+    ) -> None:
+        chunks = [make_chunk(f"Chunk {i}") for i in range(3)]
+        classifier = StubBatchClassifier()
+        service.classifier = classifier
+
+        await service.generate_cards(chunks)
+
+        assert classifier.batches == [chunks]
+        assert classifier.single_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_classification_falls_back_and_logs(
+        self,
+        service: GenerationService,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        chunks = [make_chunk(f"Chunk {i}") for i in range(3)]
+        classifier = FailingBatchClassifier(ConnectionError("classifier unavailable"))
+        service.classifier = classifier
+
+        with caplog.at_level(logging.WARNING, logger="medanki.generation.service"):
+            result = await service.generate_cards(chunks)
+
+        assert classifier.single_calls == 3
+        assert result.stats.chunks_failed == 0
+        assert "classifier unavailable" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_batch_classifier_bug_is_not_swallowed(
+        self,
+        service: GenerationService,
+    ) -> None:
+        service.classifier = FailingBatchClassifier(TypeError("bad chunk"))
+
+        with pytest.raises(TypeError, match="bad chunk"):
+            await service.generate_cards([make_chunk()])
 
     @pytest.mark.asyncio
     async def test_uses_topic_for_generation(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
         topic_id = "cardiology.arrythmia"
+        service.cloze_generator = Mock(wraps=stubs.cloze_generator)
 
         await service.generate_cards([chunk], topic_id=topic_id)
 
-        call_kwargs = mock_cloze_generator.generate.call_args
+        call_kwargs = service.cloze_generator.generate.call_args
         assert call_kwargs.kwargs.get("topic_id") == topic_id or topic_id in str(call_kwargs)
 
     @pytest.mark.asyncio
     async def test_tracks_provenance(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
         card = make_cloze_card(chunk)
-        mock_cloze_generator.generate.return_value = [card]
+        stubs.cloze_generator.cards = [card]
 
         result = await service.generate_cards([chunk])
 
@@ -281,58 +321,11 @@ class TestPipeline:
 
 
 class TestBatchProcessing:
-    @pytest.fixture
-    def mock_cloze_generator(self) -> MagicMock:
-        gen = MagicMock()
-        gen.generate = AsyncMock(return_value=[])
-        return gen
-
-    @pytest.fixture
-    def mock_vignette_generator(self) -> MagicMock:
-        gen = MagicMock()
-        gen.generate = AsyncMock(return_value=[])
-        return gen
-
-    @pytest.fixture
-    def mock_validator(self) -> MagicMock:
-        validator = MagicMock()
-        validator.validate = AsyncMock(return_value=(True, []))
-        return validator
-
-    @pytest.fixture
-    def mock_deduplicator(self) -> MagicMock:
-        dedup = MagicMock()
-        dedup.deduplicate = MagicMock(side_effect=lambda cards: cards)
-        return dedup
-
-    @pytest.fixture
-    def mock_classifier(self) -> MagicMock:
-        classifier = MagicMock()
-        classifier.classify_chunk = AsyncMock(return_value=ChunkType.CONCEPT)
-        return classifier
-
-    @pytest.fixture
-    def service(
-        self,
-        mock_cloze_generator: MagicMock,
-        mock_vignette_generator: MagicMock,
-        mock_validator: MagicMock,
-        mock_deduplicator: MagicMock,
-        mock_classifier: MagicMock,
-    ) -> GenerationService:
-        return GenerationService(
-            cloze_generator=mock_cloze_generator,
-            vignette_generator=mock_vignette_generator,
-            validator=mock_validator,
-            deduplicator=mock_deduplicator,
-            classifier=mock_classifier,
-        )
-
     @pytest.mark.asyncio
     async def test_generate_from_document(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         from pathlib import Path
 
@@ -346,7 +339,7 @@ class TestBatchProcessing:
         chunks = [make_chunk(f"Chunk {i}") for i in range(3)]
 
         for chunk in chunks:
-            mock_cloze_generator.generate.return_value = [make_cloze_card(chunk)]
+            stubs.cloze_generator.cards = [make_cloze_card(chunk)]
 
         result = await service.generate_from_document(doc, chunks)
 
@@ -356,7 +349,6 @@ class TestBatchProcessing:
     async def test_generate_from_multiple_docs(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
     ) -> None:
         from pathlib import Path
 
@@ -380,7 +372,6 @@ class TestBatchProcessing:
     async def test_progress_callback(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
     ) -> None:
         chunks = [make_chunk(f"Chunk {i}") for i in range(3)]
         progress_calls: list[tuple[int, int]] = []
@@ -393,11 +384,37 @@ class TestBatchProcessing:
         assert len(progress_calls) > 0
         assert progress_calls[-1][0] == progress_calls[-1][1]
 
+    @pytest.mark.asyncio
+    async def test_limits_concurrent_chunks(
+        self,
+        service: GenerationService,
+        stubs: SimpleNamespace,
+    ) -> None:
+        chunks = [make_chunk(f"Chunk {i}") for i in range(5)]
+        in_flight = 0
+        peak = 0
+
+        async def slow_generate(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return []
+
+        stubs.cloze_generator.generate = slow_generate
+
+        config = GenerationConfig(enable_vignettes=False, max_concurrency=2)
+        result = await service.generate_cards(chunks, config=config)
+
+        assert peak == 2
+        assert result.stats.chunks_processed == len(chunks)
+
     @pytest.mark.asyncio
     async def test_handles_generation_failure(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunks = [make_chunk(f"Chunk {i}") for i in range(3)]
 
@@ -413,81 +430,60 @@ class TestBatchProcessing:
                 )
             ]
 
-        mock_cloze_generator.generate.side_effect = generate_with_failure
+        stubs.cloze_generator.generate = generate_with_failure
 
         result = await service.generate_cards(chunks)
 
         assert len(result.errors) >= 1
         assert len(result.cards) >= 0
 
-
-class TestQualityControl:
-    @pytest.fixture
-    def mock_cloze_generator(self) -> MagicMock:
-        gen = MagicMock()
-        gen.generate = AsyncMock(return_value=[])
-        return gen
-
-    @pytest.fixture
-    def mock_vignette_generator(self) -> MagicMock:
-        gen = MagicMock()
-        gen.generate = AsyncMock(return_value=[])
-        return gen
-
-    @pytest.fixture
-    def mock_validator(self) -> MagicMock:
-        validator = MagicMock()
-        validator.validate = AsyncMock(return_value=(True, []))
-        return validator
-
-    @pytest.fixture
-    def mock_deduplicator(self) -> MagicMock:
-        dedup = MagicMock()
-        dedup.deduplicate = MagicMock(side_effect=lambda cards: cards)
-        return dedup
-
-    @pytest.fixture
-    def mock_classifier(self) -> MagicMock:
-        classifier = MagicMock()
-        classifier.classify_chunk = AsyncMock(return_value=ChunkType.CONCEPT)
-        return classifier
-
-    @pytest.fixture
-    def service(
+    @pytest.mark.asyncio
+    async def test_failed_generation_cancels_sibling(
         self,
-        mock_cloze_generator: MagicMock,
-        mock_vignette_generator: MagicMock,
-        mock_validator: MagicMock,
-        mock_deduplicator: MagicMock,
-        mock_classifier: MagicMock,
-    ) -> GenerationService:
-        return GenerationService(
-            cloze_generator=mock_cloze_generator,
-            vignette_generator=mock_vignette_generator,
-            validator=mock_validator,
-            deduplicator=mock_deduplicator,
-            classifier=mock_classifier,
-        )
+        service: GenerationService,
+        stubs: SimpleNamespace,
+    ) -> None:
+        vignette_cancelled = asyncio.Event()
+
+        async def failing_cloze(*args, **kwargs):
+            raise Exception("Cloze generation failed")
+
+        async def slow_vignette(*args, **kwargs):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                vignette_cancelled.set()
+                raise
 
+        stubs.cloze_generator.generate = failing_cloze
+        stubs.vignette_generator.generate = slow_vignette
+
+        result = await service.generate_cards([make_chunk()])
+        await asyncio.wait_for(vignette_cancelled.wait(), timeout=1)
+
+        assert result.stats.chunks_failed == 1
+        assert result.errors[0].error_message == "Cloze generation failed"
+
+
+class TestQualityControl:
     @pytest.mark.asyncio
     async def test_filters_low_confidence(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
-        mock_validator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
         good_card = make_cloze_card(chunk)
         bad_card = make_cloze_card(chunk)
 
-        mock_cloze_generator.generate.return_value = [good_card, bad_card]
+        stubs.cloze_generator.cards = [good_card, bad_card]
 
         async def validate_card(card, source_content=None):
             if card is bad_card:
                 return (False, ["Low confidence"])
             return (True, [])
 
-        mock_validator.validate.side_effect = validate_card
+        stubs.validator.validate = validate_card
 
         result = await service.generate_cards([chunk])
 
@@ -498,27 +494,27 @@ class TestQualityControl:
     async def test_hallucination_check_enabled(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
-        mock_validator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk("The heart pumps blood.")
         card = make_cloze_card(chunk)
-        mock_cloze_generator.generate.return_value = [card]
+        stubs.cloze_generator.cards = [card]
+        service.validator = Mock(wraps=stubs.validator)
 
         config = GenerationConfig(check_hallucination=True)
         await service.generate_cards([chunk], config=config)
 
-        call_args = mock_validator.validate.call_args
+        call_args = service.validator.validate.call_args
         assert call_args is not None
 
     @pytest.mark.asyncio
     async def test_returns_generation_stats(
         self,
         service: GenerationService,
-        mock_cloze_generator: MagicMock,
+        stubs: SimpleNamespace,
     ) -> None:
         chunk = make_chunk()
-        mock_cloze_generator.generate.return_value = [make_cloze_card(chunk)]
+        stubs.cloze_generator.cards = [make_cloze_card(chunk)]
 
         result = await service.generate_cards([chunk])
 
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, MagicMock
+from typing import Any
 
 import pytest
 
@@ -13,271 +13,280 @@ from medanki.generation.validator import (
     VignetteCardInput as VignetteCard,
 )
 
+pytestmark = pytest.mark.xdist_group("validator")
 
-class TestClozeSchemaValidation:
-    def test_valid_cloze_passes(self):
-        validator = CardValidator()
-        card = ClozeCard(
-            text="The {{c1::mitochondria}} is the powerhouse of the cell.",
-            source_chunk="The mitochondria is the powerhouse of the cell.",
-        )
 
-        result = validator.validate_schema(card)
+class _AccuracyStub:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.payload = payload
+        self.calls = 0
 
-        assert result.status == ValidationStatus.VALID
-        assert len(result.issues) == 0
+    async def check_accuracy(self, claim: str) -> dict[str, Any]:
+        self.calls += 1
+        return self.payload
 
-    def test_missing_cloze_fails(self):
-        validator = CardValidator()
-        card = ClozeCard(
-            text="The mitochondria is the powerhouse of the cell.",
-            source_chunk="The mitochondria is the powerhouse of the cell.",
-        )
 
-        result = validator.validate_schema(card)
+class _GroundingStub:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.payload = payload
+        self.calls = 0
 
-        assert result.status == ValidationStatus.INVALID
-        assert any("cloze" in issue.lower() for issue in result.issues)
+    async def check_grounding(self, claim: str, source: str) -> dict[str, Any]:
+        self.calls += 1
+        return self.payload
 
-    def test_malformed_cloze_fails(self):
-        validator = CardValidator()
-        card = ClozeCard(
-            text="The {{c1: mitochondria}} is the powerhouse of the cell.",
-            source_chunk="The mitochondria is the powerhouse of the cell.",
-        )
 
-        result = validator.validate_schema(card)
+def _issue_contains(result, *needles):
+    joined = " ".join(result.issues).lower()
+    return any(needle in joined for needle in needles)
 
-        assert result.status == ValidationStatus.INVALID
-        assert any(
-            "malformed" in issue.lower() or "syntax" in issue.lower() for issue in result.issues
-        )
 
-    def test_answer_too_long_fails(self):
-        validator = CardValidator()
-        card = ClozeCard(
-            text="CHF is treated with {{c1::ACE inhibitors beta blockers diuretics and aldosterone antagonists together}}.",
-            source_chunk="CHF is treated with ACE inhibitors beta blockers diuretics and aldosterone antagonists together.",
-        )
+@pytest.fixture(scope="session")
+def validator():
+    return CardValidator()
 
-        result = validator.validate_schema(card)
 
-        assert result.status == ValidationStatus.INVALID
-        assert any("long" in issue.lower() or "word" in issue.lower() for issue in result.issues)
+_MITOCHONDRIA_SOURCE = "The mitochondria is the powerhouse of the cell."
+_CHEST_PAIN_STEM = (
+    "A 45-year-old male presents with chest pain. Which is the most likely diagnosis?"
+)
+_CHEST_PAIN_SOURCE = "Chest pain in middle-aged men is often MI."
+_FIVE_OPTIONS = ("A. MI", "B. PE", "C. Pneumonia", "D. GERD", "E. Costochondritis")
 
+_VALID_CLOZE = ClozeCard(
+    text="The {{c1::mitochondria}} is the powerhouse of the cell.",
+    source_chunk=_MITOCHONDRIA_SOURCE,
+)
+_MISSING_CLOZE = ClozeCard(text=_MITOCHONDRIA_SOURCE, source_chunk=_MITOCHONDRIA_SOURCE)
+_MALFORMED_CLOZE = ClozeCard(
+    text="The {{c1: mitochondria}} is the powerhouse of the cell.",
+    source_chunk=_MITOCHONDRIA_SOURCE,
+)
+_TOO_LONG_CLOZE = ClozeCard(
+    text="CHF is treated with {{c1::ACE inhibitors beta blockers diuretics and aldosterone antagonists together}}.",
+    source_chunk="CHF is treated with ACE inhibitors beta blockers diuretics and aldosterone antagonists together.",
+)
 
-class TestVignetteAgeValidation:
-    """Tests for vignette age validation."""
+_VALID_VIGNETTE = VignetteCard(
+    stem=_CHEST_PAIN_STEM,
+    options=list(_FIVE_OPTIONS),
+    correct_answer="A",
+    source_chunk=_CHEST_PAIN_SOURCE,
+)
+_VIGNETTE_MISSING_OPTIONS = VignetteCard(
+    stem=_CHEST_PAIN_STEM,
+    options=list(_FIVE_OPTIONS[:3]),
+    correct_answer="A",
+    source_chunk=_CHEST_PAIN_SOURCE,
+)
+_VIGNETTE_INVALID_ANSWER = VignetteCard(
+    stem=_CHEST_PAIN_STEM,
+    options=list(_FIVE_OPTIONS),
+    correct_answer="F",
+    source_chunk=_CHEST_PAIN_SOURCE,
+)
+_VIGNETTE_WITHOUT_AGE = VignetteCard(
+    stem="A male patient presents with chest pain. Which is the most likely diagnosis?",
+    options=list(_FIVE_OPTIONS),
+    correct_answer="A",
+    source_chunk="Chest pain is often MI.",
+)
 
-    def test_validate_vignette_without_age_passes_basic_schema(self):
-        """Vignette without patient age passes basic schema validation (age check is separate concern)."""
-        validator = CardValidator()
-        card = VignetteCard(
-            stem="A male patient presents with chest pain. Which is the most likely diagnosis?",
-            options=["A. MI", "B. PE", "C. Pneumonia", "D. GERD", "E. Costochondritis"],
-            correct_answer="A",
-            source_chunk="Chest pain is often MI.",
-        )
 
+class TestClozeSchemaValidation:
+    @pytest.mark.parametrize(
+        ("card", "status", "keywords"),
+        [
+            pytest.param(_VALID_CLOZE, ValidationStatus.VALID, (), id="valid"),
+            pytest.param(_MISSING_CLOZE, ValidationStatus.INVALID, ("cloze",), id="missing"),
+            pytest.param(
+                _MALFORMED_CLOZE,
+                ValidationStatus.INVALID,
+                ("malformed", "syntax"),
+                id="malformed",
+            ),
+            pytest.param(
+                _TOO_LONG_CLOZE, ValidationStatus.INVALID, ("long", "word"), id="too_long"
+            ),
+        ],
+    )
+    def test_cloze_schema(self, validator, card, status, keywords):
         result = validator.validate_schema(card)
 
-        assert result.status == ValidationStatus.VALID
+        assert result.status == status
+        if keywords:
+            assert _issue_contains(result, *keywords)
+        else:
+            assert len(result.issues) == 0
 
 
-class TestVignetteSchemaValidation:
-    def test_valid_vignette_passes(self):
-        validator = CardValidator()
-        card = VignetteCard(
-            stem="A 45-year-old male presents with chest pain. Which is the most likely diagnosis?",
-            options=["A. MI", "B. PE", "C. Pneumonia", "D. GERD", "E. Costochondritis"],
-            correct_answer="A",
-            source_chunk="Chest pain in middle-aged men is often MI.",
-        )
+class TestVignetteAgeValidation:
+    """Tests for vignette age validation."""
 
-        result = validator.validate_schema(card)
+    def test_validate_vignette_without_age_passes_basic_schema(self, validator):
+        """Vignette without patient age passes basic schema validation (age check is separate concern)."""
+        result = validator.validate_schema(_VIGNETTE_WITHOUT_AGE)
 
         assert result.status == ValidationStatus.VALID
-        assert len(result.issues) == 0
-
-    def test_vignette_missing_options_fails(self):
-        validator = CardValidator()
-        card = VignetteCard(
-            stem="A 45-year-old male presents with chest pain. Which is the most likely diagnosis?",
-            options=["A. MI", "B. PE", "C. Pneumonia"],
-            correct_answer="A",
-            source_chunk="Chest pain in middle-aged men is often MI.",
-        )
-
-        result = validator.validate_schema(card)
-
-        assert result.status == ValidationStatus.INVALID
-        assert any("option" in issue.lower() or "5" in issue for issue in result.issues)
 
-    def test_vignette_invalid_answer_fails(self):
-        validator = CardValidator()
-        card = VignetteCard(
-            stem="A 45-year-old male presents with chest pain. Which is the most likely diagnosis?",
-            options=["A. MI", "B. PE", "C. Pneumonia", "D. GERD", "E. Costochondritis"],
-            correct_answer="F",
-            source_chunk="Chest pain in middle-aged men is often MI.",
-        )
 
+class TestVignetteSchemaValidation:
+    @pytest.mark.parametrize(
+        ("card", "status", "keywords"),
+        [
+            pytest.param(_VALID_VIGNETTE, ValidationStatus.VALID, (), id="valid"),
+            pytest.param(
+                _VIGNETTE_MISSING_OPTIONS,
+                ValidationStatus.INVALID,
+                ("option", "5"),
+                id="missing_options",
+            ),
+            pytest.param(
+                _VIGNETTE_INVALID_ANSWER,
+                ValidationStatus.INVALID,
+                ("answer",),
+                id="invalid_answer",
+            ),
+        ],
+    )
+    def test_vignette_schema(self, validator, card, status, keywords):
         result = validator.validate_schema(card)
 
-        assert result.status == ValidationStatus.INVALID
-        assert any("answer" in issue.lower() for issue in result.issues)
+        assert result.status == status
+        if keywords:
+            assert _issue_contains(result, *keywords)
+        else:
+            assert len(result.issues) == 0
 
 
-class TestMedicalAccuracyValidation:
-    @pytest.fixture
-    def mock_llm_client(self):
-        client = MagicMock()
-        client.check_accuracy = AsyncMock()
-        return client
-
-    @pytest.mark.asyncio
-    async def test_accurate_claim_passes(self, mock_llm_client):
-        mock_llm_client.check_accuracy.return_value = {
+_ACCURACY_CASES = [
+    pytest.param(
+        ClozeCard(
+            text="The {{c1::left ventricle}} pumps blood to the systemic circulation.",
+            source_chunk="The left ventricle pumps blood to the systemic circulation.",
+        ),
+        {
             "is_accurate": True,
             "confidence": 0.95,
             "explanation": "Statement is factually correct.",
-        }
-
-        validator = CardValidator(llm_client=mock_llm_client)
-        card = ClozeCard(
-            text="The {{c1::left ventricle}} pumps blood to the systemic circulation.",
-            source_chunk="The left ventricle pumps blood to the systemic circulation.",
-        )
-
-        result = await validator.validate_accuracy(card)
-
-        assert result.status == ValidationStatus.VALID
-        mock_llm_client.check_accuracy.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_inaccurate_claim_fails(self, mock_llm_client):
-        mock_llm_client.check_accuracy.return_value = {
+        },
+        ValidationStatus.VALID,
+        (),
+        id="accurate",
+    ),
+    pytest.param(
+        ClozeCard(
+            text="The {{c1::right ventricle}} pumps blood to the systemic circulation.",
+            source_chunk="The right ventricle pumps blood to the systemic circulation.",
+        ),
+        {
             "is_accurate": False,
             "confidence": 0.92,
             "explanation": "The right ventricle pumps to pulmonary, not systemic.",
-        }
-
-        validator = CardValidator(llm_client=mock_llm_client)
-        card = ClozeCard(
-            text="The {{c1::right ventricle}} pumps blood to the systemic circulation.",
-            source_chunk="The right ventricle pumps blood to the systemic circulation.",
-        )
-
-        result = await validator.validate_accuracy(card)
-
-        assert result.status == ValidationStatus.INVALID
-        assert any(
-            "inaccurate" in issue.lower() or "incorrect" in issue.lower() for issue in result.issues
-        )
-
-    @pytest.mark.asyncio
-    async def test_returns_confidence_score(self, mock_llm_client):
-        mock_llm_client.check_accuracy.return_value = {
+        },
+        ValidationStatus.INVALID,
+        ("inaccurate", "incorrect"),
+        id="inaccurate",
+    ),
+    pytest.param(
+        ClozeCard(
+            text="The {{c1::mitochondria}} produces ATP.",
+            source_chunk="The mitochondria produces ATP.",
+        ),
+        {
             "is_accurate": True,
             "confidence": 0.87,
             "explanation": "Statement is correct.",
-        }
-
-        validator = CardValidator(llm_client=mock_llm_client)
-        card = ClozeCard(
-            text="The {{c1::mitochondria}} produces ATP.",
-            source_chunk="The mitochondria produces ATP.",
-        )
-
-        result = await validator.validate_accuracy(card)
-
-        assert result.confidence is not None
-        assert 0.0 <= result.confidence <= 1.0
-
-    @pytest.mark.asyncio
-    async def test_flags_uncertain_claims(self, mock_llm_client):
-        mock_llm_client.check_accuracy.return_value = {
+        },
+        ValidationStatus.VALID,
+        (),
+        id="confidence_score",
+    ),
+    pytest.param(
+        ClozeCard(
+            text="The {{c1::experimental drug X}} treats condition Y.",
+            source_chunk="The experimental drug X treats condition Y.",
+        ),
+        {
             "is_accurate": True,
             "confidence": 0.55,
             "explanation": "Statement may be correct but requires verification.",
-        }
+        },
+        ValidationStatus.NEEDS_REVIEW,
+        (),
+        id="uncertain",
+    ),
+]
 
-        validator = CardValidator(llm_client=mock_llm_client)
-        card = ClozeCard(
-            text="The {{c1::experimental drug X}} treats condition Y.",
-            source_chunk="The experimental drug X treats condition Y.",
-        )
+
+class TestMedicalAccuracyValidation:
+    @pytest.mark.parametrize(("card", "payload", "status", "keywords"), _ACCURACY_CASES)
+    async def test_accuracy(self, card, payload, status, keywords):
+        llm_client = _AccuracyStub(payload)
+        validator = CardValidator(llm_client=llm_client)
 
         result = await validator.validate_accuracy(card)
 
-        assert result.status == ValidationStatus.NEEDS_REVIEW
-        assert result.confidence < 0.7
+        assert result.status == status
+        assert result.confidence == payload["confidence"]
+        assert 0.0 <= result.confidence <= 1.0
+        assert llm_client.calls == 1
+        if keywords:
+            assert _issue_contains(result, *keywords)
 
 
 class TestHallucinationDetection:
-    @pytest.fixture
-    def mock_llm_client(self):
-        client = MagicMock()
-        client.check_grounding = AsyncMock()
-        return client
-
-    @pytest.mark.asyncio
-    async def test_detects_unsupported_claim(self, mock_llm_client):
-        mock_llm_client.check_grounding.return_value = {
-            "is_grounded": False,
-            "explanation": "Claim about dosage not found in source.",
-        }
-
-        validator = CardValidator(llm_client=mock_llm_client)
-        card = ClozeCard(
-            text="Metformin is dosed at {{c1::500mg}} initially.",
-            source_chunk="Metformin is used for type 2 diabetes management.",
-        )
-
-        result = await validator.validate_grounding(card)
-
-        assert result.status == ValidationStatus.INVALID
-        assert any(
-            "unsupported" in issue.lower()
-            or "grounded" in issue.lower()
-            or "source" in issue.lower()
-            for issue in result.issues
-        )
-
-    @pytest.mark.asyncio
-    async def test_detects_entity_mismatch(self, mock_llm_client):
-        mock_llm_client.check_grounding.return_value = {
-            "is_grounded": False,
-            "explanation": "Drug name mismatch: source says Metformin, card says Metoprolol.",
-        }
-
-        validator = CardValidator(llm_client=mock_llm_client)
-        card = ClozeCard(
-            text="{{c1::Metoprolol}} is used for type 2 diabetes.",
-            source_chunk="Metformin is used for type 2 diabetes management.",
-        )
+    @pytest.mark.parametrize(
+        ("card", "payload", "status", "keywords"),
+        [
+            pytest.param(
+                ClozeCard(
+                    text="Metformin is dosed at {{c1::500mg}} initially.",
+                    source_chunk="Metformin is used for type 2 diabetes management.",
+                ),
+                {
+                    "is_grounded": False,
+                    "explanation": "Claim about dosage not found in source.",
+                },
+                ValidationStatus.INVALID,
+                ("unsupported", "grounded", "source"),
+                id="unsupported_claim",
+            ),
+            pytest.param(
+                ClozeCard(
+                    text="{{c1::Metoprolol}} is used for type 2 diabetes.",
+                    source_chunk="Metformin is used for type 2 diabetes management.",
+                ),
+                {
+                    "is_grounded": False,
+                    "explanation": "Drug name mismatch: source says Metformin, card says Metoprolol.",
+                },
+                ValidationStatus.INVALID,
+                ("mismatch", "entity", "source"),
+                id="entity_mismatch",
+            ),
+            pytest.param(
+                ClozeCard(
+                    text="{{c1::Metformin}} is used for type 2 diabetes.",
+                    source_chunk="Metformin is used for type 2 diabetes management.",
+                ),
+                {
+                    "is_grounded": True,
+                    "explanation": "All claims are supported by the source text.",
+                },
+                ValidationStatus.VALID,
+                (),
+                id="supported_claim",
+            ),
+        ],
+    )
+    async def test_grounding(self, card, payload, status, keywords):
+        llm_client = _GroundingStub(payload)
+        validator = CardValidator(llm_client=llm_client)
 
         result = await validator.validate_grounding(card)
 
-        assert result.status == ValidationStatus.INVALID
-        assert any(
-            "mismatch" in issue.lower() or "entity" in issue.lower() or "source" in issue.lower()
-            for issue in result.issues
-        )
-
-    @pytest.mark.asyncio
-    async def test_allows_supported_claims(self, mock_llm_client):
-        mock_llm_client.check_grounding.return_value = {
-            "is_grounded": True,
-            "explanation": "All claims are supported by the source text.",
-        }
-
-        validator = CardValidator(llm_client=mock_llm_client)
-        card = ClozeCard(
-            text="{{c1::Metformin}} is used for type 2 diabetes.",
-            source_chunk="Metformin is used for type 2 diabetes management.",
-        )
-
-        result = await validator.validate_grounding(card)
-
-        assert result.status == ValidationStatus.VALID
+        assert result.status == status
+        assert llm_client.calls == 1
+        if keywords:
+            assert _issue_contains(result, *keywords)
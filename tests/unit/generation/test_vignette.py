@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-from unittest.mock import AsyncMock, MagicMock
+from types import MappingProxyType, SimpleNamespace
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
 import pytest
@@ -10,509 +10,488 @@ from medanki.generation.vignette import VignetteGenerator
 from medanki.models.cards import VignetteCard
 
 if TYPE_CHECKING:
-    pass
+    from collections.abc import Callable, Mapping
 
 
-class TestVignetteCardStructure:
-    @pytest.fixture
-    def mock_llm_client(self) -> MagicMock:
-        client = MagicMock()
-        client.generate_structured = AsyncMock()
-        return client
-
-    @pytest.fixture
-    def generator(self, mock_llm_client: MagicMock) -> VignetteGenerator:
-        return VignetteGenerator(llm_client=mock_llm_client)
-
-    @pytest.mark.asyncio
-    async def test_generates_vignette_cards(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 45-year-old male presents with chest pain.",
-                    question="What is the most likely diagnosis?",
-                    options=[
-                        MagicMock(letter="A", text="Myocardial infarction"),
-                        MagicMock(letter="B", text="Pulmonary embolism"),
-                        MagicMock(letter="C", text="Aortic dissection"),
-                        MagicMock(letter="D", text="Pericarditis"),
-                        MagicMock(letter="E", text="Costochondritis"),
-                    ],
-                    answer="A",
-                    explanation="The presentation is classic for MI.",
-                )
-            ]
-        )
+_SOURCE_CHUNK_ID = uuid4()
+_CONTENT = "Medical content"
 
-        cards = await generator.generate(
-            content="Cardiology content about chest pain",
-            source_chunk_id=uuid4(),
-        )
 
-        assert isinstance(cards, list)
-        assert len(cards) > 0
-        assert all(isinstance(card, VignetteCard) for card in cards)
+def _option(letter: str, text: str) -> SimpleNamespace:
+    return SimpleNamespace(letter=letter, text=text)
 
-    @pytest.mark.asyncio
-    async def test_has_clinical_stem(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 55-year-old woman with diabetes presents with acute onset dyspnea.",
-                    question="What is the next best step?",
-                    options=[
-                        MagicMock(letter="A", text="ECG"),
-                        MagicMock(letter="B", text="Chest X-ray"),
-                        MagicMock(letter="C", text="D-dimer"),
-                        MagicMock(letter="D", text="Troponin"),
-                        MagicMock(letter="E", text="BNP"),
-                    ],
-                    answer="A",
-                    explanation="ECG is the first step in dyspnea workup.",
-                )
-            ]
-        )
 
-        cards = await generator.generate(
-            content="Dyspnea evaluation",
-            source_chunk_id=uuid4(),
-        )
+def _card(**fields: Any) -> SimpleNamespace:
+    return SimpleNamespace(**fields)
 
-        assert cards[0].stem
-        assert len(cards[0].stem) > 20
 
-    @pytest.mark.asyncio
-    async def test_has_question(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 30-year-old male presents with fever.",
-                    question="What is the most likely diagnosis?",
-                    options=[
-                        MagicMock(letter="A", text="Pneumonia"),
-                        MagicMock(letter="B", text="URI"),
-                        MagicMock(letter="C", text="Influenza"),
-                        MagicMock(letter="D", text="COVID-19"),
-                        MagicMock(letter="E", text="Bronchitis"),
-                    ],
-                    answer="C",
-                    explanation="Influenza is common during flu season.",
-                )
-            ]
-        )
+def _response(*cards: SimpleNamespace) -> SimpleNamespace:
+    return SimpleNamespace(cards=cards)
 
-        cards = await generator.generate(
-            content="Infectious diseases",
-            source_chunk_id=uuid4(),
-        )
 
-        assert cards[0].question
-        assert "?" in cards[0].question
+class _Client:
+    def __init__(self) -> None:
+        self._next: SimpleNamespace | None = None
 
-    @pytest.mark.asyncio
-    async def test_has_five_options(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 60-year-old presents with hypertension.",
-                    question="What is the first-line treatment?",
-                    options=[
-                        MagicMock(letter="A", text="Lisinopril"),
-                        MagicMock(letter="B", text="Metoprolol"),
-                        MagicMock(letter="C", text="Amlodipine"),
-                        MagicMock(letter="D", text="Hydrochlorothiazide"),
-                        MagicMock(letter="E", text="Losartan"),
-                    ],
-                    answer="A",
-                    explanation="ACE inhibitors are first-line.",
-                )
-            ]
-        )
+    def set(self, response: SimpleNamespace) -> None:
+        self._next = response
 
-        cards = await generator.generate(
-            content="Hypertension treatment",
-            source_chunk_id=uuid4(),
-        )
+    async def generate_structured(self, *args: Any, **kwargs: Any) -> SimpleNamespace | None:
+        return self._next
 
-        assert len(cards[0].options) == 5
-        expected_letters = ["A", "B", "C", "D", "E"]
-        actual_letters = [opt.letter for opt in cards[0].options]
-        assert actual_letters == expected_letters
 
-    @pytest.mark.asyncio
-    async def test_has_correct_answer(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A patient presents with symptoms.",
-                    question="What is the diagnosis?",
-                    options=[
-                        MagicMock(letter="A", text="Disease A"),
-                        MagicMock(letter="B", text="Disease B"),
-                        MagicMock(letter="C", text="Disease C"),
-                        MagicMock(letter="D", text="Disease D"),
-                        MagicMock(letter="E", text="Disease E"),
-                    ],
-                    answer="B",
-                    explanation="Disease B is correct.",
-                )
-            ]
-        )
+@pytest.fixture(scope="module")
+def mock_llm_client() -> _Client:
+    return _Client()
 
-        cards = await generator.generate(
-            content="Medical content",
-            source_chunk_id=uuid4(),
-        )
 
-        assert cards[0].answer in ["A", "B", "C", "D", "E"]
+@pytest.fixture(scope="module")
+def generator(mock_llm_client: _Client) -> VignetteGenerator:
+    return VignetteGenerator(llm_client=mock_llm_client)
 
-    @pytest.mark.asyncio
-    async def test_has_explanation(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="Clinical presentation.",
-                    question="What is the mechanism?",
-                    options=[
-                        MagicMock(letter="A", text="Mechanism A"),
-                        MagicMock(letter="B", text="Mechanism B"),
-                        MagicMock(letter="C", text="Mechanism C"),
-                        MagicMock(letter="D", text="Mechanism D"),
-                        MagicMock(letter="E", text="Mechanism E"),
-                    ],
-                    answer="A",
-                    explanation="The mechanism involves specific pathophysiology that explains the clinical findings.",
-                )
-            ]
-        )
 
-        cards = await generator.generate(
-            content="Pathophysiology content",
-            source_chunk_id=uuid4(),
-        )
+def _check_generates_cards(cards: list[VignetteCard]) -> None:
+    assert isinstance(cards, list)
+    assert len(cards) > 0
+    assert all(isinstance(card, VignetteCard) for card in cards)
 
-        assert cards[0].explanation
-        assert len(cards[0].explanation) > 10
 
+def _check_clinical_stem(cards: list[VignetteCard]) -> None:
+    assert cards[0].stem
+    assert len(cards[0].stem) > 20
 
-class TestClinicalRealism:
-    @pytest.fixture
-    def mock_llm_client(self) -> MagicMock:
-        client = MagicMock()
-        client.generate_structured = AsyncMock()
-        return client
-
-    @pytest.fixture
-    def generator(self, mock_llm_client: MagicMock) -> VignetteGenerator:
-        return VignetteGenerator(llm_client=mock_llm_client)
-
-    @pytest.mark.asyncio
-    async def test_includes_demographics(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 52-year-old female smoker presents with chronic cough.",
-                    question="What is the most likely diagnosis?",
-                    options=[
-                        MagicMock(letter="A", text="COPD"),
-                        MagicMock(letter="B", text="Asthma"),
-                        MagicMock(letter="C", text="Lung cancer"),
-                        MagicMock(letter="D", text="Bronchiectasis"),
-                        MagicMock(letter="E", text="Tuberculosis"),
-                    ],
-                    answer="A",
-                    explanation="COPD is common in smokers.",
-                )
-            ]
-        )
 
-        cards = await generator.generate(
-            content="Pulmonology content",
-            source_chunk_id=uuid4(),
-        )
+def _check_question(cards: list[VignetteCard]) -> None:
+    assert cards[0].question
+    assert "?" in cards[0].question
 
-        stem = cards[0].stem.lower()
-        has_age = any(char.isdigit() for char in cards[0].stem)
-        has_sex = "male" in stem or "female" in stem or "woman" in stem or "man" in stem
-        assert has_age, "Stem should include patient age"
-        assert has_sex, "Stem should include patient sex"
 
-    @pytest.mark.asyncio
-    async def test_includes_relevant_history(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 65-year-old male with a history of diabetes and hypertension presents with crushing chest pain radiating to the left arm. He denies recent trauma.",
-                    question="What is the most likely diagnosis?",
-                    options=[
-                        MagicMock(letter="A", text="STEMI"),
-                        MagicMock(letter="B", text="NSTEMI"),
-                        MagicMock(letter="C", text="Unstable angina"),
-                        MagicMock(letter="D", text="Stable angina"),
-                        MagicMock(letter="E", text="GERD"),
-                    ],
-                    answer="A",
-                    explanation="Classic STEMI presentation with risk factors.",
-                )
-            ]
-        )
+def _check_five_options(cards: list[VignetteCard]) -> None:
+    assert len(cards[0].options) == 5
+    expected_letters = ["A", "B", "C", "D", "E"]
+    actual_letters = [opt.letter for opt in cards[0].options]
+    assert actual_letters == expected_letters
 
-        cards = await generator.generate(
-            content="Cardiology emergency",
-            source_chunk_id=uuid4(),
-        )
 
-        stem = cards[0].stem.lower()
-        has_history = "history" in stem or "diabetes" in stem or "hypertension" in stem
-        assert has_history, "Stem should include relevant medical history"
+def _check_correct_answer(cards: list[VignetteCard]) -> None:
+    assert cards[0].answer in ["A", "B", "C", "D", "E"]
 
-    @pytest.mark.asyncio
-    async def test_includes_physical_exam(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 45-year-old male presents with abdominal pain. On examination, there is rebound tenderness in the right lower quadrant.",
-                    question="What is the most likely diagnosis?",
-                    options=[
-                        MagicMock(letter="A", text="Appendicitis"),
-                        MagicMock(letter="B", text="Cholecystitis"),
-                        MagicMock(letter="C", text="Pancreatitis"),
-                        MagicMock(letter="D", text="Diverticulitis"),
-                        MagicMock(letter="E", text="Gastritis"),
-                    ],
-                    answer="A",
-                    explanation="RLQ tenderness with rebound is classic for appendicitis.",
-                )
-            ]
-        )
 
-        cards = await generator.generate(
-            content="Acute abdomen",
-            source_chunk_id=uuid4(),
-        )
+def _check_explanation(cards: list[VignetteCard]) -> None:
+    assert cards[0].explanation
+    assert len(cards[0].explanation) > 10
 
-        stem = cards[0].stem.lower()
-        has_exam = (
-            "examination" in stem
-            or "exam" in stem
-            or "tenderness" in stem
-            or "auscultation" in stem
-        )
-        assert has_exam, "Stem should include physical examination findings when appropriate"
 
-    @pytest.mark.asyncio
-    async def test_includes_lab_values(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 58-year-old diabetic presents with fatigue. Labs show: Hemoglobin 8.5 g/dL, MCV 110 fL, serum B12 150 pg/mL.",
-                    question="What is the most likely cause of anemia?",
-                    options=[
-                        MagicMock(letter="A", text="B12 deficiency"),
-                        MagicMock(letter="B", text="Iron deficiency"),
-                        MagicMock(letter="C", text="Folate deficiency"),
-                        MagicMock(letter="D", text="Chronic disease"),
-                        MagicMock(letter="E", text="Hemolysis"),
-                    ],
-                    answer="A",
-                    explanation="Low B12 with macrocytic anemia indicates B12 deficiency.",
-                )
-            ]
-        )
+_SEX_KEYWORDS = ("male", "female", "woman", "man")
+_HISTORY_KEYWORDS = ("history", "diabetes", "hypertension")
+_EXAM_KEYWORDS = ("examination", "exam", "tenderness", "auscultation")
+_LAB_UNITS = ("g/dL", "mg/dL", "mL", "fL")
 
-        cards = await generator.generate(
-            content="Hematology labs",
-            source_chunk_id=uuid4(),
-        )
 
-        stem = cards[0].stem
-        has_units = "g/dL" in stem or "mg/dL" in stem or "mL" in stem or "fL" in stem
-        assert has_units, "Lab values should include units"
+def _check_demographics(cards: list[VignetteCard]) -> None:
+    stem = cards[0].stem
+    stem_lower = stem.lower()
+    has_age = any(char.isdigit() for char in stem)
+    has_sex = any(keyword in stem_lower for keyword in _SEX_KEYWORDS)
+    assert has_age, "Stem should include patient age"
+    assert has_sex, "Stem should include patient sex"
 
-    @pytest.mark.asyncio
-    async def test_distractor_quality(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 35-year-old presents with palpitations and weight loss.",
-                    question="What is the most likely diagnosis?",
-                    options=[
-                        MagicMock(letter="A", text="Hyperthyroidism"),
-                        MagicMock(letter="B", text="Pheochromocytoma"),
-                        MagicMock(letter="C", text="Anxiety disorder"),
-                        MagicMock(letter="D", text="Atrial fibrillation"),
-                        MagicMock(letter="E", text="Carcinoid syndrome"),
-                    ],
-                    answer="A",
-                    explanation="Palpitations and weight loss are classic for hyperthyroidism.",
-                )
-            ]
-        )
 
-        cards = await generator.generate(
-            content="Endocrinology",
-            source_chunk_id=uuid4(),
-        )
+def _check_relevant_history(cards: list[VignetteCard]) -> None:
+    stem_lower = cards[0].stem.lower()
+    has_history = any(keyword in stem_lower for keyword in _HISTORY_KEYWORDS)
+    assert has_history, "Stem should include relevant medical history"
 
-        options = cards[0].options
-        option_texts = [opt.text for opt in options]
-        assert len(set(option_texts)) == 5, "All options should be unique"
-        for opt in options:
-            assert len(opt.text) >= 3, "Distractor options should be substantive"
 
+def _check_physical_exam(cards: list[VignetteCard]) -> None:
+    stem_lower = cards[0].stem.lower()
+    has_exam = any(keyword in stem_lower for keyword in _EXAM_KEYWORDS)
+    assert has_exam, "Stem should include physical examination findings when appropriate"
 
-class TestUSMLEStyle:
-    @pytest.fixture
-    def mock_llm_client(self) -> MagicMock:
-        client = MagicMock()
-        client.generate_structured = AsyncMock()
-        return client
-
-    @pytest.fixture
-    def generator(self, mock_llm_client: MagicMock) -> VignetteGenerator:
-        return VignetteGenerator(llm_client=mock_llm_client)
-
-    @pytest.mark.asyncio
-    async def test_asks_next_step(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
-    ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 70-year-old presents to the ED with chest pain.",
-                    question="What is the next best step in management?",
-                    options=[
-                        MagicMock(letter="A", text="ECG"),
-                        MagicMock(letter="B", text="Troponin"),
-                        MagicMock(letter="C", text="CT angiography"),
-                        MagicMock(letter="D", text="Echocardiogram"),
-                        MagicMock(letter="E", text="Stress test"),
-                    ],
-                    answer="A",
-                    explanation="ECG is always first in chest pain evaluation.",
-                )
-            ]
-        )
 
-        cards = await generator.generate(
-            content="Emergency cardiology",
-            source_chunk_id=uuid4(),
-            question_type="next_step",
-        )
+def _check_lab_units(cards: list[VignetteCard]) -> None:
+    stem = cards[0].stem
+    has_units = any(unit in stem for unit in _LAB_UNITS)
+    assert has_units, "Lab values should include units"
+
+
+def _check_distractors(cards: list[VignetteCard]) -> None:
+    options = cards[0].options
+    option_texts = [opt.text for opt in options]
+    assert len(set(option_texts)) == 5, "All options should be unique"
+    for opt in options:
+        assert len(opt.text) >= 3, "Distractor options should be substantive"
+
+
+def _check_asks_next_step(cards: list[VignetteCard]) -> None:
+    question = cards[0].question.lower()
+    assert "next" in question or "step" in question or "management" in question
+
+
+def _check_asks_diagnosis(cards: list[VignetteCard]) -> None:
+    question = cards[0].question.lower()
+    assert "diagnosis" in question or "likely" in question
+
+
+def _check_asks_mechanism(cards: list[VignetteCard]) -> None:
+    question = cards[0].question.lower()
+    assert "mechanism" in question or "how" in question or "why" in question
+
+
+def _check_has_cards(cards: list[VignetteCard]) -> None:
+    assert len(cards) > 0
+
+
+_STRUCTURE_CASES = [
+    pytest.param(
+        _response(
+            _card(
+                stem="A 45-year-old male presents with chest pain.",
+                question="What is the most likely diagnosis?",
+                options=(
+                    _option("A", "Myocardial infarction"),
+                    _option("B", "Pulmonary embolism"),
+                    _option("C", "Aortic dissection"),
+                    _option("D", "Pericarditis"),
+                    _option("E", "Costochondritis"),
+                ),
+                answer="A",
+                explanation="The presentation is classic for MI.",
+            )
+        ),
+        _check_generates_cards,
+        id="generates_vignette_cards",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A 55-year-old woman with diabetes presents with acute onset dyspnea.",
+                question="What is the next best step?",
+                options=(
+                    _option("A", "ECG"),
+                    _option("B", "Chest X-ray"),
+                    _option("C", "D-dimer"),
+                    _option("D", "Troponin"),
+                    _option("E", "BNP"),
+                ),
+                answer="A",
+                explanation="ECG is the first step in dyspnea workup.",
+            )
+        ),
+        _check_clinical_stem,
+        id="has_clinical_stem",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A 30-year-old male presents with fever.",
+                question="What is the most likely diagnosis?",
+                options=(
+                    _option("A", "Pneumonia"),
+                    _option("B", "URI"),
+                    _option("C", "Influenza"),
+                    _option("D", "COVID-19"),
+                    _option("E", "Bronchitis"),
+                ),
+                answer="C",
+                explanation="Influenza is common during flu season.",
+            )
+        ),
+        _check_question,
+        id="has_question",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A 60-year-old presents with hypertension.",
+                question="What is the first-line treatment?",
+                options=(
+                    _option("A", "Lisinopril"),
+                    _option("B", "Metoprolol"),
+                    _option("C", "Amlodipine"),
+                    _option("D", "Hydrochlorothiazide"),
+                    _option("E", "Losartan"),
+                ),
+                answer="A",
+                explanation="ACE inhibitors are first-line.",
+            )
+        ),
+        _check_five_options,
+        id="has_five_options",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A patient presents with symptoms.",
+                question="What is the diagnosis?",
+                options=(
+                    _option("A", "Disease A"),
+                    _option("B", "Disease B"),
+                    _option("C", "Disease C"),
+                    _option("D", "Disease D"),
+                    _option("E", "Disease E"),
+                ),
+                answer="B",
+                explanation="Disease B is correct.",
+            )
+        ),
+        _check_correct_answer,
+        id="has_correct_answer",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="Clinical presentation.",
+                question="What is the mechanism?",
+                options=(
+                    _option("A", "Mechanism A"),
+                    _option("B", "Mechanism B"),
+                    _option("C", "Mechanism C"),
+                    _option("D", "Mechanism D"),
+                    _option("E", "Mechanism E"),
+                ),
+                answer="A",
+                explanation="The mechanism involves specific pathophysiology that explains the clinical findings.",
+            )
+        ),
+        _check_explanation,
+        id="has_explanation",
+    ),
+]
 
-        question = cards[0].question.lower()
-        assert "next" in question or "step" in question or "management" in question
 
-    @pytest.mark.asyncio
-    async def test_asks_diagnosis(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
+class TestVignetteCardStructure:
+    @pytest.mark.parametrize(("response", "check"), _STRUCTURE_CASES)
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_card_structure(
+        self,
+        generator: VignetteGenerator,
+        mock_llm_client: _Client,
+        response: SimpleNamespace,
+        check: Callable[[list[VignetteCard]], None],
     ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 25-year-old presents with joint pain and butterfly rash.",
-                    question="What is the most likely diagnosis?",
-                    options=[
-                        MagicMock(letter="A", text="SLE"),
-                        MagicMock(letter="B", text="Rheumatoid arthritis"),
-                        MagicMock(letter="C", text="Dermatomyositis"),
-                        MagicMock(letter="D", text="Scleroderma"),
-                        MagicMock(letter="E", text="Sjogren syndrome"),
-                    ],
-                    answer="A",
-                    explanation="Butterfly rash with joint pain is pathognomonic for SLE.",
-                )
-            ]
-        )
-
-        cards = await generator.generate(
-            content="Rheumatology",
-            source_chunk_id=uuid4(),
-            question_type="diagnosis",
-        )
+        mock_llm_client.set(response)
+
+        cards = await generator.generate(content=_CONTENT, source_chunk_id=_SOURCE_CHUNK_ID)
+
+        check(cards)
+
+
+_REALISM_CASES = [
+    pytest.param(
+        _response(
+            _card(
+                stem="A 52-year-old female smoker presents with chronic cough.",
+                question="What is the most likely diagnosis?",
+                options=(
+                    _option("A", "COPD"),
+                    _option("B", "Asthma"),
+                    _option("C", "Lung cancer"),
+                    _option("D", "Bronchiectasis"),
+                    _option("E", "Tuberculosis"),
+                ),
+                answer="A",
+                explanation="COPD is common in smokers.",
+            )
+        ),
+        _check_demographics,
+        id="includes_demographics",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A 65-year-old male with a history of diabetes and hypertension presents with crushing chest pain radiating to the left arm. He denies recent trauma.",
+                question="What is the most likely diagnosis?",
+                options=(
+                    _option("A", "STEMI"),
+                    _option("B", "NSTEMI"),
+                    _option("C", "Unstable angina"),
+                    _option("D", "Stable angina"),
+                    _option("E", "GERD"),
+                ),
+                answer="A",
+                explanation="Classic STEMI presentation with risk factors.",
+            )
+        ),
+        _check_relevant_history,
+        id="includes_relevant_history",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A 45-year-old male presents with abdominal pain. On examination, there is rebound tenderness in the right lower quadrant.",
+                question="What is the most likely diagnosis?",
+                options=(
+                    _option("A", "Appendicitis"),
+                    _option("B", "Cholecystitis"),
+                    _option("C", "Pancreatitis"),
+                    _option("D", "Diverticulitis"),
+                    _option("E", "Gastritis"),
+                ),
+                answer="A",
+                explanation="RLQ tenderness with rebound is classic for appendicitis.",
+            )
+        ),
+        _check_physical_exam,
+        id="includes_physical_exam",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A 58-year-old diabetic presents with fatigue. Labs show: Hemoglobin 8.5 g/dL, MCV 110 fL, serum B12 150 pg/mL.",
+                question="What is the most likely cause of anemia?",
+                options=(
+                    _option("A", "B12 deficiency"),
+                    _option("B", "Iron deficiency"),
+                    _option("C", "Folate deficiency"),
+                    _option("D", "Chronic disease"),
+                    _option("E", "Hemolysis"),
+                ),
+                answer="A",
+                explanation="Low B12 with macrocytic anemia indicates B12 deficiency.",
+            )
+        ),
+        _check_lab_units,
+        id="includes_lab_values",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A 35-year-old presents with palpitations and weight loss.",
+                question="What is the most likely diagnosis?",
+                options=(
+                    _option("A", "Hyperthyroidism"),
+                    _option("B", "Pheochromocytoma"),
+                    _option("C", "Anxiety disorder"),
+                    _option("D", "Atrial fibrillation"),
+                    _option("E", "Carcinoid syndrome"),
+                ),
+                answer="A",
+                explanation="Palpitations and weight loss are classic for hyperthyroidism.",
+            )
+        ),
+        _check_distractors,
+        id="distractor_quality",
+    ),
+]
 
-        question = cards[0].question.lower()
-        assert "diagnosis" in question or "likely" in question
 
-    @pytest.mark.asyncio
-    async def test_asks_mechanism(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
+class TestClinicalRealism:
+    @pytest.mark.parametrize(("response", "check"), _REALISM_CASES)
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_clinical_realism(
+        self,
+        generator: VignetteGenerator,
+        mock_llm_client: _Client,
+        response: SimpleNamespace,
+        check: Callable[[list[VignetteCard]], None],
     ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A patient on warfarin develops bleeding after starting fluconazole.",
-                    question="What is the mechanism of this drug interaction?",
-                    options=[
-                        MagicMock(letter="A", text="CYP450 inhibition"),
-                        MagicMock(letter="B", text="CYP450 induction"),
-                        MagicMock(letter="C", text="Protein displacement"),
-                        MagicMock(letter="D", text="Renal competition"),
-                        MagicMock(letter="E", text="GI absorption"),
-                    ],
-                    answer="A",
-                    explanation="Fluconazole inhibits CYP2C9, increasing warfarin levels.",
-                )
-            ]
-        )
-
-        cards = await generator.generate(
-            content="Pharmacology interactions",
-            source_chunk_id=uuid4(),
-            question_type="mechanism",
-        )
+        mock_llm_client.set(response)
+
+        cards = await generator.generate(content=_CONTENT, source_chunk_id=_SOURCE_CHUNK_ID)
+
+        check(cards)
+
+
+_USMLE_STYLE_CASES = [
+    pytest.param(
+        _response(
+            _card(
+                stem="A 70-year-old presents to the ED with chest pain.",
+                question="What is the next best step in management?",
+                options=(
+                    _option("A", "ECG"),
+                    _option("B", "Troponin"),
+                    _option("C", "CT angiography"),
+                    _option("D", "Echocardiogram"),
+                    _option("E", "Stress test"),
+                ),
+                answer="A",
+                explanation="ECG is always first in chest pain evaluation.",
+            )
+        ),
+        MappingProxyType({"question_type": "next_step"}),
+        _check_asks_next_step,
+        id="asks_next_step",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A 25-year-old presents with joint pain and butterfly rash.",
+                question="What is the most likely diagnosis?",
+                options=(
+                    _option("A", "SLE"),
+                    _option("B", "Rheumatoid arthritis"),
+                    _option("C", "Dermatomyositis"),
+                    _option("D", "Scleroderma"),
+                    _option("E", "Sjogren syndrome"),
+                ),
+                answer="A",
+                explanation="Butterfly rash with joint pain is pathognomonic for SLE.",
+            )
+        ),
+        MappingProxyType({"question_type": "diagnosis"}),
+        _check_asks_diagnosis,
+        id="asks_diagnosis",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A patient on warfarin develops bleeding after starting fluconazole.",
+                question="What is the mechanism of this drug interaction?",
+                options=(
+                    _option("A", "CYP450 inhibition"),
+                    _option("B", "CYP450 induction"),
+                    _option("C", "Protein displacement"),
+                    _option("D", "Renal competition"),
+                    _option("E", "GI absorption"),
+                ),
+                answer="A",
+                explanation="Fluconazole inhibits CYP2C9, increasing warfarin levels.",
+            )
+        ),
+        MappingProxyType({"question_type": "mechanism"}),
+        _check_asks_mechanism,
+        id="asks_mechanism",
+    ),
+    pytest.param(
+        _response(
+            _card(
+                stem="A 40-year-old presents with symptoms.",
+                question="What is the diagnosis?",
+                options=(
+                    _option("A", "Condition A"),
+                    _option("B", "Condition B"),
+                    _option("C", "Condition C"),
+                    _option("D", "Condition D"),
+                    _option("E", "Condition E"),
+                ),
+                answer="A",
+                explanation="Detailed explanation.",
+            )
+        ),
+        MappingProxyType({"difficulty": "step1"}),
+        _check_has_cards,
+        id="appropriate_difficulty",
+    ),
+]
 
-        question = cards[0].question.lower()
-        assert "mechanism" in question or "how" in question or "why" in question
 
-    @pytest.mark.asyncio
-    async def test_appropriate_difficulty(
-        self, generator: VignetteGenerator, mock_llm_client: MagicMock
+class TestUSMLEStyle:
+    @pytest.mark.parametrize(("response", "options", "check"), _USMLE_STYLE_CASES)
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_usmle_style(
+        self,
+        generator: VignetteGenerator,
+        mock_llm_client: _Client,
+        response: SimpleNamespace,
+        options: Mapping[str, Any],
+        check: Callable[[list[VignetteCard]], None],
     ) -> None:
-        mock_llm_client.generate_structured.return_value = MagicMock(
-            cards=[
-                MagicMock(
-                    stem="A 40-year-old presents with symptoms.",
-                    question="What is the diagnosis?",
-                    options=[
-                        MagicMock(letter="A", text="Condition A"),
-                        MagicMock(letter="B", text="Condition B"),
-                        MagicMock(letter="C", text="Condition C"),
-                        MagicMock(letter="D", text="Condition D"),
-                        MagicMock(letter="E", text="Condition E"),
-                    ],
-                    answer="A",
-                    explanation="Detailed explanation.",
-                )
-            ]
-        )
+        mock_llm_client.set(response)
 
         cards = await generator.generate(
-            content="Medical content",
-            source_chunk_id=uuid4(),
-            difficulty="step1",
+            content=_CONTENT, source_chunk_id=_SOURCE_CHUNK_ID, **options
         )
 
-        assert len(cards) > 0
+        check(cards)
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-import tempfile
+import re
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from scripts.fetch_anking_sources import (
     ANKING_REPO_URL,
     RESOURCE_SHEETS,
@@ -13,88 +16,122 @@ from scripts.fetch_anking_sources import (
     fetch_resource_sheets,
 )
 
+_SHEET_URL = re.compile(r"^https://docs\.google\.com/spreadsheets/.*export\?format=csv")
+
+
+class _StubFrame:
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: int) -> None:
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def to_csv(self, path: Path, index: bool = True) -> None:
+        pass
+
+
+class _StubPandas:
+    def __init__(self) -> None:
+        self.result: _StubFrame | Exception = _StubFrame(0)
+
+    def read_csv(self, url: str) -> _StubFrame:
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.fixture
+def pandas_stub(monkeypatch: pytest.MonkeyPatch) -> _StubPandas:
+    stub = _StubPandas()
+    monkeypatch.setitem(sys.modules, "pandas", stub)
+    return stub
+
 
 class TestCloneAnkingRepo:
-    def test_skips_if_exists(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            target = Path(tmpdir)
-            (target / "AnKing-v11").mkdir()
+    def test_skips_if_exists(self, tmp_path: Path):
+        (tmp_path / "AnKing-v11").mkdir()
+
+        result = clone_anking_repo(tmp_path)
+        assert result is True
+
+    @patch("scripts.fetch_anking_sources.subprocess.run")
+    def test_clone_success(self, mock_run: MagicMock, tmp_path: Path):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+
+        result = clone_anking_repo(tmp_path, shallow=True)
+
+        assert result is True
+        mock_run.assert_called_once()
+        call_args = mock_run.call_args[0][0]
+        assert "git" in call_args
+        assert "clone" in call_args
+        assert "--depth" in call_args
+        assert "1" in call_args
+        assert ANKING_REPO_URL in call_args
+
+    @patch("scripts.fetch_anking_sources.subprocess.run")
+    def test_full_clone_fetches_all_blobs(self, mock_run: MagicMock, tmp_path: Path):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+
+        result = clone_anking_repo(tmp_path, shallow=False)
 
-            result = clone_anking_repo(target)
-            assert result is True
+        assert result is True
+        call_args = mock_run.call_args[0][0]
+        assert "--filter=blob:none" not in call_args
+        assert "--depth" not in call_args
 
     @patch("scripts.fetch_anking_sources.subprocess.run")
-    def test_clone_success(self, mock_run: MagicMock):
+    def test_partial_clone_skips_historical_blobs(self, mock_run: MagicMock, tmp_path: Path):
         mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            target = Path(tmpdir)
-            result = clone_anking_repo(target, shallow=True)
+        result = clone_anking_repo(tmp_path, shallow=False, partial=True)
 
-            assert result is True
-            mock_run.assert_called_once()
-            call_args = mock_run.call_args[0][0]
-            assert "git" in call_args
-            assert "clone" in call_args
-            assert "--depth" in call_args
-            assert "1" in call_args
-            assert ANKING_REPO_URL in call_args
+        assert result is True
+        call_args = mock_run.call_args[0][0]
+        assert "--filter=blob:none" in call_args
 
     @patch("scripts.fetch_anking_sources.subprocess.run")
-    def test_clone_failure(self, mock_run: MagicMock):
+    def test_clone_failure(self, mock_run: MagicMock, tmp_path: Path):
         mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="Clone failed")
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            target = Path(tmpdir)
-            result = clone_anking_repo(target)
+        result = clone_anking_repo(tmp_path)
 
-            assert result is False
+        assert result is False
 
 
 class TestFetchResourceSheets:
-    @patch.dict("sys.modules", {"pandas": MagicMock()})
-    def test_fetch_sheets_success(self):
-        import sys
+    def test_fetch_sheets_success(self, pandas_stub: _StubPandas, tmp_path: Path):
+        pandas_stub.result = _StubFrame(100)
 
-        mock_pd = sys.modules["pandas"]
-        mock_df = MagicMock()
-        mock_df.__len__ = lambda self: 100
-        mock_pd.read_csv.return_value = mock_df
+        results = fetch_resource_sheets(tmp_path)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            target = Path(tmpdir)
-            results = fetch_resource_sheets(target)
+        assert all(results.values())
+        assert len(results) == len(RESOURCE_SHEETS)
 
-            assert all(results.values())
-            assert len(results) == len(RESOURCE_SHEETS)
+    def test_fetch_sheets_failure(self, pandas_stub: _StubPandas, tmp_path: Path):
+        pandas_stub.result = Exception("Network error")
 
-    @patch.dict("sys.modules", {"pandas": MagicMock()})
-    def test_fetch_sheets_failure(self):
-        import sys
+        results = fetch_resource_sheets(tmp_path)
 
-        mock_pd = sys.modules["pandas"]
-        mock_pd.read_csv.side_effect = Exception("Network error")
+        assert all(v is False for v in results.values())
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            target = Path(tmpdir)
-            results = fetch_resource_sheets(target)
+    def test_fetch_without_sheets(self, pandas_stub: _StubPandas, tmp_path: Path):
+        pandas_stub.result = _StubFrame(10)
 
-            assert all(v is False for v in results.values())
+        with patch.dict(RESOURCE_SHEETS, clear=True):
+            results = fetch_resource_sheets(tmp_path)
 
-    @patch.dict("sys.modules", {"pandas": MagicMock()})
-    def test_creates_target_directory(self):
-        import sys
+        assert results == {}
 
-        mock_pd = sys.modules["pandas"]
-        mock_df = MagicMock()
-        mock_df.__len__ = lambda self: 10
-        mock_pd.read_csv.return_value = mock_df
+    def test_creates_target_directory(self, pandas_stub: _StubPandas, tmp_path: Path):
+        pandas_stub.result = _StubFrame(10)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            target = Path(tmpdir) / "nested" / "sheets"
-            fetch_resource_sheets(target)
+        target = tmp_path / "nested" / "sheets"
+        fetch_resource_sheets(target)
 
-            assert target.exists()
+        assert target.exists()
 
 
 class TestResourceSheetUrls:
@@ -104,6 +141,4 @@ class TestResourceSheetUrls:
         assert "sketchy" in RESOURCE_SHEETS
 
     def test_urls_are_google_sheets(self):
-        for url in RESOURCE_SHEETS.values():
-            assert "docs.google.com/spreadsheets" in url
-            assert "export?format=csv" in url
+        assert all(map(_SHEET_URL.search, RESOURCE_SHEETS.values()))
@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import Mock
 
 import pytest
 
 from scripts.ingest.huggingface import (
+    REQUIRED_MEDMCQA_FIELDS,
     DatasetConfig,
     HuggingFaceIngestor,
     TopicStats,
@@ -24,6 +26,7 @@ class MockDataset:
     def __init__(self, data: list[dict[str, Any]], split: str = "train"):
         self._data = data
         self._split = split
+        self._columns = {key: [item[key] for item in data] for key in data[0]} if data else {}
 
     def __len__(self) -> int:
         return len(self._data)
@@ -33,9 +36,14 @@ class MockDataset:
 
     def __getitem__(self, key: str | int):
         if isinstance(key, str):
-            return [item[key] for item in self._data]
+            return self._columns[key]
         return self._data[key]
 
+    def select_columns(self, column_names: list[str]) -> MockDataset:
+        return MockDataset(
+            [{name: item[name] for name in column_names} for item in self._data], self._split
+        )
+
     def filter(self, fn):
         filtered = [item for item in self._data if fn(item)]
         return MockDataset(filtered, self._split)
@@ -66,7 +74,7 @@ class MockDatasetDict:
         return self._datasets.keys()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def medmcqa_sample_data() -> list[dict[str, Any]]:
     """Sample MedMCQA data for testing."""
     return [
@@ -125,7 +133,7 @@ def medmcqa_sample_data() -> list[dict[str, Any]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def medqa_sample_data() -> list[dict[str, Any]]:
     """Sample MedQA data for testing."""
     return [
@@ -156,7 +164,7 @@ def medqa_sample_data() -> list[dict[str, Any]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def flashcards_sample_data() -> list[dict[str, Any]]:
     """Sample medical flashcards data."""
     return [
@@ -173,7 +181,7 @@ def flashcards_sample_data() -> list[dict[str, Any]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_medmcqa(medmcqa_sample_data: list[dict[str, Any]]) -> MockDatasetDict:
     """Create mock MedMCQA dataset."""
     return MockDatasetDict(
@@ -185,12 +193,26 @@ def mock_medmcqa(medmcqa_sample_data: list[dict[str, Any]]) -> MockDatasetDict:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_medqa(medqa_sample_data: list[dict[str, Any]]) -> MockDatasetDict:
     """Create mock MedQA dataset."""
     return MockDatasetDict({"train": MockDataset(medqa_sample_data, "train")})
 
 
+@pytest.fixture(scope="module", autouse=True)
+def _fake_load_dataset(
+    mock_medmcqa: MockDatasetDict, mock_medqa: MockDatasetDict
+) -> Iterator[None]:
+    """Serve the mock datasets in place of the Hub for every test in this module."""
+
+    def load(repo: str, **kwargs: Any) -> MockDatasetDict:
+        return mock_medmcqa if "medmcqa" in repo else mock_medqa
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("scripts.ingest.huggingface.load_dataset", load)
+        yield
+
+
 class TestDatasetConfig:
     """Tests for DatasetConfig model."""
 
@@ -230,6 +252,23 @@ class TestTopicStats:
         assert stats.get_unique_topics("Anatomy") == 2
         assert stats.get_topic_count("Anatomy", "Nervous system") == 2
 
+    def test_add_topics_matches_add_topic(self) -> None:
+        """add_topics counts a batch of pairs the same as repeated add_topic calls."""
+        pairs = [
+            ("Anatomy", "Nervous system"),
+            ("Physiology", "Endocrine"),
+            ("Anatomy", "Nervous system"),
+            ("Anatomy", "Cardiovascular"),
+        ]
+        batched = TopicStats()
+        batched.add_topics(pairs)
+        single = TopicStats()
+        for subject, topic in pairs:
+            single.add_topic(subject, topic)
+
+        assert batched.to_dict() == single.to_dict()
+        assert batched.get_subject_count("Anatomy") == 3
+
     def test_topic_stats_to_dict(self) -> None:
         """TopicStats can be serialized to dict."""
         stats = TopicStats()
@@ -250,8 +289,7 @@ class TestExtractMedmcqaTopics:
         self, mock_medmcqa: MockDatasetDict, medmcqa_sample_data: list[dict[str, Any]]
     ) -> None:
         """Extracts all unique subjects from dataset."""
-        with patch("scripts.ingest.huggingface.load_dataset", return_value=mock_medmcqa):
-            stats = extract_medmcqa_topics()
+        stats = extract_medmcqa_topics()
 
         subjects = list(stats.to_dict().keys())
         expected_subjects = {"Anatomy", "Physiology", "Pharmacology"}
@@ -259,8 +297,7 @@ class TestExtractMedmcqaTopics:
 
     def test_counts_topics_per_subject(self, mock_medmcqa: MockDatasetDict) -> None:
         """Correctly counts topics within each subject."""
-        with patch("scripts.ingest.huggingface.load_dataset", return_value=mock_medmcqa):
-            stats = extract_medmcqa_topics()
+        stats = extract_medmcqa_topics()
 
         result = stats.to_dict()
         assert result["Anatomy"]["total_questions"] == 2
@@ -269,12 +306,22 @@ class TestExtractMedmcqaTopics:
 
     def test_handles_multiple_splits(self, mock_medmcqa: MockDatasetDict) -> None:
         """Can process multiple splits if specified."""
-        with patch("scripts.ingest.huggingface.load_dataset", return_value=mock_medmcqa):
-            stats = extract_medmcqa_topics(splits=["train", "validation"])
+        stats = extract_medmcqa_topics(splits=["train", "validation"])
 
         result = stats.to_dict()
         assert result["Anatomy"]["total_questions"] >= 2
 
+    def test_reads_only_required_columns(self, medmcqa_sample_data: list[dict[str, Any]]) -> None:
+        """Projects each split down to the fields the record validation needs."""
+        validation = MockDataset(medmcqa_sample_data, "validation")
+        validation.select_columns = Mock(wraps=validation.select_columns)
+
+        extract_medmcqa_topics(
+            splits=["validation"], ds=MockDatasetDict({"validation": validation})
+        )
+
+        validation.select_columns.assert_called_once_with(sorted(REQUIRED_MEDMCQA_FIELDS))
+
 
 class TestHuggingFaceIngestor:
     """Tests for the main HuggingFaceIngestor class."""
@@ -297,14 +344,13 @@ class TestHuggingFaceIngestor:
         tmp_path: Path,
     ) -> None:
         """Downloads dataset and saves to parquet."""
-        with patch("scripts.ingest.huggingface.load_dataset", return_value=mock_medmcqa):
-            ingestor = HuggingFaceIngestor(output_dir=tmp_path)
-            config = DatasetConfig(
-                name="medmcqa",
-                repo="openlifescienceai/medmcqa",
-                description="Test",
-            )
-            paths = ingestor.download_dataset(config)
+        ingestor = HuggingFaceIngestor(output_dir=tmp_path)
+        config = DatasetConfig(
+            name="medmcqa",
+            repo="openlifescienceai/medmcqa",
+            description="Test",
+        )
+        paths = ingestor.download_dataset(config)
 
         assert len(paths) == 3
         assert any("train" in str(p) for p in paths)
@@ -317,41 +363,67 @@ class TestHuggingFaceIngestor:
     ) -> None:
         """Downloads all configured datasets."""
 
-        def mock_load(repo: str, **kwargs):
-            if "medmcqa" in repo:
-                return mock_medmcqa
-            return mock_medqa
-
-        with patch("scripts.ingest.huggingface.load_dataset", side_effect=mock_load):
-            ingestor = HuggingFaceIngestor(output_dir=tmp_path)
-            results = ingestor.download_all()
+        ingestor = HuggingFaceIngestor(output_dir=tmp_path)
+        results = ingestor.download_all()
 
         assert len(results) >= 2
 
+    def test_download_all_without_configs(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        """Returns an empty result when no datasets are configured."""
+        monkeypatch.setattr("scripts.ingest.huggingface.get_dataset_configs", list)
+
+        ingestor = HuggingFaceIngestor(output_dir=tmp_path)
+
+        assert ingestor.download_all() == {}
+
     def test_extract_topics_to_json(
         self,
         mock_medmcqa: MockDatasetDict,
         tmp_path: Path,
     ) -> None:
         """Extracts topics and saves to JSON file."""
-        with patch("scripts.ingest.huggingface.load_dataset", return_value=mock_medmcqa):
-            ingestor = HuggingFaceIngestor(output_dir=tmp_path)
-            output_path = ingestor.extract_topics(tmp_path / "topics.json")
+        ingestor = HuggingFaceIngestor(output_dir=tmp_path)
+        output_path = ingestor.extract_topics(tmp_path / "topics.json")
 
         assert output_path.exists()
         data = json.loads(output_path.read_text())
         assert "Anatomy" in data
         assert "topics" in data["Anatomy"]
 
+    def test_reuses_loaded_dataset(
+        self,
+        mock_medmcqa: MockDatasetDict,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        """Downloading and then extracting topics loads MedMCQA only once."""
+        loaded: list[str] = []
+
+        def load(repo: str) -> MockDatasetDict:
+            loaded.append(repo)
+            return mock_medmcqa
+
+        monkeypatch.setattr("scripts.ingest.huggingface.load_dataset", load)
+        ingestor = HuggingFaceIngestor(output_dir=tmp_path)
+        config = next(c for c in get_dataset_configs() if c.name == "medmcqa")
+
+        ingestor.download_dataset(config)
+        ingestor.extract_topics(tmp_path / "topics.json")
+
+        assert loaded == ["openlifescienceai/medmcqa"]
+
     def test_filter_step1_questions(
         self,
         mock_medqa: MockDatasetDict,
     ) -> None:
         """Filters MedQA to only Step 1 questions."""
-        with patch("scripts.ingest.huggingface.load_dataset", return_value=mock_medqa):
-            from scripts.ingest.huggingface import filter_medqa_by_step
+        from scripts.ingest.huggingface import filter_medqa_by_step
 
-            step1_data = filter_medqa_by_step(mock_medqa["train"], step="step1")
+        step1_data = filter_medqa_by_step(mock_medqa["train"], step="step1")
 
         assert len(step1_data) == 1
         assert step1_data[0]["meta_info"] == "step1"
@@ -389,6 +461,38 @@ class TestTopicEnrichment:
         assert "cns" in keywords or "central nervous system" in keywords
         assert "cardiovascular" in keywords
 
+    def test_generate_keywords_splits_on_word_boundaries(self) -> None:
+        """Keeps every word and splits on any non-word character, including non-ASCII."""
+        from scripts.ingest.huggingface import generate_keywords
+
+        keywords = generate_keywords(
+            [
+                "Drugs of the CNS—Anti-epileptics (2nd gen.)",
+                "Café-au-lait spots «skin»",
+                "beta_blockers & Cardiovascular’s",
+            ]
+        )
+
+        assert sorted(keywords) == [
+            "2nd",
+            "anti",
+            "au",
+            "beta_blockers",
+            "café",
+            "cardiovascular",
+            "cns",
+            "cvs",
+            "drugs",
+            "epileptics",
+            "gen",
+            "lait",
+            "of",
+            "s",
+            "skin",
+            "spots",
+            "the",
+        ]
+
     def test_enrich_taxonomy_structure(self, tmp_path: Path) -> None:
         """Enriches taxonomy JSON with topic keywords."""
         from scripts.ingest.huggingface import enrich_taxonomy
@@ -445,8 +549,7 @@ class TestCLICommands:
 
         output = tmp_path / "output.json"
 
-        with patch("scripts.ingest.huggingface.load_dataset", return_value=mock_medmcqa):
-            extract_topics_command(output=output)
+        extract_topics_command(output=output)
 
         assert output.exists()
         data = json.loads(output.read_text())
@@ -460,11 +563,7 @@ class TestCLICommands:
         """download-all command downloads datasets."""
         from scripts.ingest.huggingface import download_all_command
 
-        def mock_load(repo: str, **kwargs):
-            return mock_medmcqa
-
-        with patch("scripts.ingest.huggingface.load_dataset", side_effect=mock_load):
-            download_all_command(output_dir=tmp_path)
+        download_all_command(output_dir=tmp_path)
 
     def test_enrich_taxonomy_command(
         self,
@@ -535,9 +634,8 @@ class TestStatisticsGeneration:
         mock_medmcqa: MockDatasetDict,
     ) -> None:
         """Generates summary statistics for dataset."""
-        with patch("scripts.ingest.huggingface.load_dataset", return_value=mock_medmcqa):
-            stats = extract_medmcqa_topics()
-            summary = stats.get_summary()
+        stats = extract_medmcqa_topics()
+        summary = stats.get_summary()
 
         assert "total_questions" in summary
         assert "total_subjects" in summary
@@ -7,31 +7,29 @@ from medanki.ingestion.pdf import PDFExtractor
 
 FIXTURES_DIR = Path(__file__).parent.parent.parent.parent / "data" / "test_fixtures"
 
+pytestmark = pytest.mark.xdist_group("pdf")
 
-class TestPDFExtractor:
-    def test_extract_text_from_pdf(self):
-        extractor = PDFExtractor()
-        doc = extractor.extract(FIXTURES_DIR / "sample.pdf")
 
-        assert "Introduction" in doc.content
-        assert "Cell Biology" in doc.content
-        assert "Biology is the study of living organisms" in doc.content
+@pytest.fixture(scope="module")
+def sample_doc() -> Document:
+    return PDFExtractor().extract(FIXTURES_DIR / "sample.pdf")
 
-    def test_extract_preserves_sections(self):
-        extractor = PDFExtractor()
-        doc = extractor.extract(FIXTURES_DIR / "sample.pdf")
 
-        section_titles = [s.title for s in doc.sections]
+class TestPDFExtractor:
+    def test_extract_text_from_pdf(self, sample_doc):
+        assert "Introduction" in sample_doc.content
+        assert "Cell Biology" in sample_doc.content
+        assert "Biology is the study of living organisms" in sample_doc.content
+
+    def test_extract_preserves_sections(self, sample_doc):
+        section_titles = [s.title for s in sample_doc.sections]
         assert any("Introduction" in title for title in section_titles)
         assert any("Cell Biology" in title for title in section_titles)
 
-    def test_extract_includes_page_numbers(self):
-        extractor = PDFExtractor()
-        doc = extractor.extract(FIXTURES_DIR / "sample.pdf")
-
-        assert doc.metadata.get("page_count") == 2
-        assert len(doc.sections) >= 1
-        for section in doc.sections:
+    def test_extract_includes_page_numbers(self, sample_doc):
+        assert sample_doc.metadata.get("page_count") == 2
+        assert len(sample_doc.sections) >= 1
+        for section in sample_doc.sections:
             assert section.page_number is not None
             assert section.page_number >= 1
 
@@ -53,12 +51,9 @@ class TestPDFExtractor:
         with pytest.raises(IngestionError):
             extractor.extract(corrupted_pdf)
 
-    def test_returns_document_model(self):
-        extractor = PDFExtractor()
-        doc = extractor.extract(FIXTURES_DIR / "sample.pdf")
-
-        assert isinstance(doc, Document)
-        assert doc.content is not None
-        assert doc.sections is not None
-        assert doc.metadata is not None
-        assert doc.source_path == FIXTURES_DIR / "sample.pdf"
+    def test_returns_document_model(self, sample_doc):
+        assert isinstance(sample_doc, Document)
+        assert sample_doc.content is not None
+        assert sample_doc.sections is not None
+        assert sample_doc.metadata is not None
+        assert sample_doc.source_path == FIXTURES_DIR / "sample.pdf"
@@ -4,16 +4,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
-from unittest.mock import AsyncMock
+from typing import Any
 
 import pytest
 
-if TYPE_CHECKING:
-    from medanki.ingestion.service import IngestionService
+from medanki.ingestion.errors import IngestionError
+from medanki.ingestion.service import IngestionService
+from medanki.models.document import Section
+from medanki.models.enums import ContentType
 
 
-@dataclass
+@dataclass(slots=True)
 class MockDocument:
     """Mock document for testing."""
 
@@ -23,47 +24,70 @@ class MockDocument:
     content_type: Any = None
 
 
+class _StubExtractor:
+    def __init__(self, result: MockDocument | Exception) -> None:
+        self.result = result
+        self.calls: list[Path] = []
+
+    async def extract(self, path: Path) -> MockDocument:
+        self.calls.append(path)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class _StubLoader:
+    def __init__(self, result: MockDocument | Exception) -> None:
+        self.result = result
+        self.calls: list[Path] = []
+
+    async def load(self, path: Path) -> MockDocument:
+        self.calls.append(path)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
 @pytest.fixture
-def mock_pdf_extractor() -> AsyncMock:
-    """Create a mock PDF extractor."""
-    extractor = AsyncMock()
-    extractor.extract.return_value = MockDocument(
-        raw_text="PDF content here.",
-        sections=[],
-        metadata={"page_count": 5},
+def mock_pdf_extractor() -> _StubExtractor:
+    """Create a stub PDF extractor."""
+    return _StubExtractor(
+        MockDocument(
+            raw_text="PDF content here.",
+            sections=[],
+            metadata={"page_count": 5},
+        )
     )
-    return extractor
 
 
 @pytest.fixture
-def mock_text_loader() -> AsyncMock:
-    """Create a mock text loader."""
-    loader = AsyncMock()
-    loader.load.return_value = MockDocument(
-        raw_text="Text content here.",
-        sections=[],
-        metadata={},
+def mock_text_loader() -> _StubLoader:
+    """Create a stub text loader."""
+    return _StubLoader(
+        MockDocument(
+            raw_text="Text content here.",
+            sections=[],
+            metadata={},
+        )
     )
-    return loader
 
 
 @pytest.fixture
 def ingestion_service(
-    mock_pdf_extractor: AsyncMock,
-    mock_text_loader: AsyncMock,
+    mock_pdf_extractor: _StubExtractor,
+    mock_text_loader: _StubLoader,
 ) -> IngestionService:
     """Create an IngestionService instance with mocked dependencies."""
-    from medanki.ingestion.service import IngestionService
-
     return IngestionService(
         pdf_extractor=mock_pdf_extractor,
         text_loader=mock_text_loader,
     )
 
 
-@pytest.fixture
-def temp_directory(tmp_path: Path) -> Path:
-    """Create a temporary directory with test files."""
+@pytest.fixture(scope="module")
+def temp_directory(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a temporary directory with test files, shared by the read-only tests."""
+    tmp_path = tmp_path_factory.mktemp("ingest")
     (tmp_path / "document.pdf").write_bytes(b"%PDF-1.4 test")
     (tmp_path / "notes.md").write_text("# Notes\n\nSome content.")
     (tmp_path / "readme.txt").write_text("Plain text content.")
@@ -80,66 +104,41 @@ def temp_directory(tmp_path: Path) -> Path:
 class TestFactoryPattern:
     """Tests for extractor factory pattern."""
 
-    @pytest.mark.asyncio
-    async def test_ingest_pdf_uses_pdf_extractor(
-        self,
-        ingestion_service: IngestionService,
-        mock_pdf_extractor: AsyncMock,
-        tmp_path: Path,
-    ) -> None:
-        """.pdf routes to PDFExtractor."""
-        pdf_file = tmp_path / "test.pdf"
-        pdf_file.write_bytes(b"%PDF-1.4 test content")
-
-        await ingestion_service.ingest_file(pdf_file)
-
-        mock_pdf_extractor.extract.assert_called_once()
-        call_args = mock_pdf_extractor.extract.call_args
-        assert call_args[0][0] == pdf_file
-
-    @pytest.mark.asyncio
-    async def test_ingest_markdown_uses_text_loader(
-        self,
-        ingestion_service: IngestionService,
-        mock_text_loader: AsyncMock,
-        tmp_path: Path,
-    ) -> None:
-        """.md routes to MarkdownLoader."""
-        md_file = tmp_path / "test.md"
-        md_file.write_text("# Test Markdown\n\nContent here.")
-
-        await ingestion_service.ingest_file(md_file)
-
-        mock_text_loader.load.assert_called_once()
-        call_args = mock_text_loader.load.call_args
-        assert call_args[0][0] == md_file
-
-    @pytest.mark.asyncio
-    async def test_ingest_txt_uses_text_loader(
+    @pytest.mark.asyncio(loop_scope="class")
+    @pytest.mark.parametrize(
+        ("filename", "content", "stub_name"),
+        [
+            pytest.param("test.pdf", b"%PDF-1.4 test content", "mock_pdf_extractor", id="pdf"),
+            pytest.param(
+                "test.md", b"# Test Markdown\n\nContent here.", "mock_text_loader", id="md"
+            ),
+            pytest.param("test.txt", b"Plain text content.", "mock_text_loader", id="txt"),
+        ],
+    )
+    async def test_routes_to_extractor(
         self,
+        request: pytest.FixtureRequest,
         ingestion_service: IngestionService,
-        mock_text_loader: AsyncMock,
         tmp_path: Path,
+        filename: str,
+        content: bytes,
+        stub_name: str,
     ) -> None:
-        """.txt routes to TextLoader."""
-        txt_file = tmp_path / "test.txt"
-        txt_file.write_text("Plain text content.")
+        """.pdf routes to PDFExtractor; .md and .txt route to the text loader."""
+        file_path = tmp_path / filename
+        file_path.write_bytes(content)
 
-        await ingestion_service.ingest_file(txt_file)
+        await ingestion_service.ingest_file(file_path)
 
-        mock_text_loader.load.assert_called_once()
-        call_args = mock_text_loader.load.call_args
-        assert call_args[0][0] == txt_file
+        assert request.getfixturevalue(stub_name).calls == [file_path]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_unsupported_format_raises(
         self,
         ingestion_service: IngestionService,
         tmp_path: Path,
     ) -> None:
         """.docx raises IngestionError."""
-        from medanki.ingestion.errors import IngestionError
-
         docx_file = tmp_path / "test.docx"
         docx_file.write_bytes(b"fake docx content")
 
@@ -148,17 +147,15 @@ class TestFactoryPattern:
 
         assert "unsupported" in str(exc_info.value).lower()
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_detects_content_type(
         self,
         ingestion_service: IngestionService,
-        mock_text_loader: AsyncMock,
+        mock_text_loader: _StubLoader,
         tmp_path: Path,
     ) -> None:
         """Sets correct ContentType enum."""
-        from medanki.models.enums import ContentType
-
-        mock_text_loader.load.return_value = MockDocument(
+        mock_text_loader.result = MockDocument(
             raw_text="Markdown content.",
             sections=[],
             metadata={},
@@ -176,36 +173,35 @@ class TestFactoryPattern:
 class TestDirectoryProcessing:
     """Tests for directory processing functionality."""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_ingest_directory_finds_files(
         self,
         ingestion_service: IngestionService,
         temp_directory: Path,
-        mock_pdf_extractor: AsyncMock,
-        mock_text_loader: AsyncMock,
+        mock_pdf_extractor: _StubExtractor,
+        mock_text_loader: _StubLoader,
     ) -> None:
         """Recursively finds supported files."""
         documents = await ingestion_service.ingest_directory(temp_directory)
 
-        total_calls = mock_pdf_extractor.extract.call_count + mock_text_loader.load.call_count
+        total_calls = len(mock_pdf_extractor.calls) + len(mock_text_loader.calls)
         assert total_calls == 5
         assert len(documents) == 5
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_ingest_directory_skips_hidden(
         self,
         ingestion_service: IngestionService,
         temp_directory: Path,
-        mock_text_loader: AsyncMock,
+        mock_text_loader: _StubLoader,
     ) -> None:
         """Ignores .dotfiles."""
         await ingestion_service.ingest_directory(temp_directory)
 
-        for call in mock_text_loader.load.call_args_list:
-            file_path = call[0][0]
+        for file_path in mock_text_loader.calls:
             assert not file_path.name.startswith(".")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_ingest_directory_returns_documents(
         self,
         ingestion_service: IngestionService,
@@ -220,7 +216,7 @@ class TestDirectoryProcessing:
             assert hasattr(doc, "source_path")
             assert hasattr(doc, "content_type")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_empty_directory_returns_empty(
         self,
         ingestion_service: IngestionService,
@@ -234,7 +230,7 @@ class TestDirectoryProcessing:
 
         assert documents == []
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_ingest_directory_non_recursive(
         self,
         ingestion_service: IngestionService,
@@ -249,15 +245,15 @@ class TestDirectoryProcessing:
 class TestNormalization:
     """Tests for text normalization functionality."""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_normalizes_whitespace(
         self,
         ingestion_service: IngestionService,
-        mock_text_loader: AsyncMock,
+        mock_text_loader: _StubLoader,
         tmp_path: Path,
     ) -> None:
         """Collapses multiple spaces/newlines."""
-        mock_text_loader.load.return_value = MockDocument(
+        mock_text_loader.result = MockDocument(
             raw_text="Text   with    multiple     spaces\n\n\n\nand newlines.",
             sections=[],
             metadata={},
@@ -273,15 +269,15 @@ class TestNormalization:
         assert "Text with multiple spaces" in document.raw_text
         assert "and newlines" in document.raw_text
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_strips_headers_footers(
         self,
         ingestion_service: IngestionService,
-        mock_pdf_extractor: AsyncMock,
+        mock_pdf_extractor: _StubExtractor,
         tmp_path: Path,
     ) -> None:
         """Removes page numbers, headers."""
-        mock_pdf_extractor.extract.return_value = MockDocument(
+        mock_pdf_extractor.result = MockDocument(
             raw_text="Page 1 of 10\n\nActual content here.\n\n- 1 -\n\nMore content.",
             sections=[],
             metadata={},
@@ -297,21 +293,19 @@ class TestNormalization:
         assert "Actual content here" in document.raw_text
         assert "More content" in document.raw_text
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_preserves_structure(
         self,
         ingestion_service: IngestionService,
-        mock_text_loader: AsyncMock,
+        mock_text_loader: _StubLoader,
         tmp_path: Path,
     ) -> None:
         """Sections maintained after normalization."""
-        from medanki.models.document import Section
-
         sections = [
             Section(title="Introduction", content="Intro text.", level=1, page_numbers=[1]),
             Section(title="Methods", content="Methods text.", level=1, page_numbers=[2]),
         ]
-        mock_text_loader.load.return_value = MockDocument(
+        mock_text_loader.result = MockDocument(
             raw_text="Full document text.",
             sections=sections,
             metadata={},
@@ -330,17 +324,15 @@ class TestNormalization:
 class TestErrorHandling:
     """Tests for error handling functionality."""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_corrupted_file_raises(
         self,
         ingestion_service: IngestionService,
-        mock_pdf_extractor: AsyncMock,
+        mock_pdf_extractor: _StubExtractor,
         tmp_path: Path,
     ) -> None:
         """Bad file raises IngestionError."""
-        from medanki.ingestion.errors import IngestionError
-
-        mock_pdf_extractor.extract.side_effect = Exception("Corrupted PDF")
+        mock_pdf_extractor.result = Exception("Corrupted PDF")
 
         pdf_file = tmp_path / "corrupted.pdf"
         pdf_file.write_bytes(b"corrupted data")
@@ -350,15 +342,13 @@ class TestErrorHandling:
 
         assert "corrupted" in str(exc_info.value).lower() or "failed" in str(exc_info.value).lower()
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_missing_file_raises(
         self,
         ingestion_service: IngestionService,
         tmp_path: Path,
     ) -> None:
         """FileNotFoundError wrapped."""
-        from medanki.ingestion.errors import IngestionError
-
         missing_file = tmp_path / "nonexistent.pdf"
 
         with pytest.raises(IngestionError) as exc_info:
@@ -369,21 +359,18 @@ class TestErrorHandling:
             or "does not exist" in str(exc_info.value).lower()
         )
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_partial_failure_continues(
         self,
         ingestion_service: IngestionService,
-        mock_pdf_extractor: AsyncMock,
-        mock_text_loader: AsyncMock,
+        mock_pdf_extractor: _StubExtractor,
+        mock_text_loader: _StubLoader,
         temp_directory: Path,
     ) -> None:
         """One bad file doesn't stop batch."""
-        call_count = 0
         original_extract = mock_pdf_extractor.extract
 
         async def extract_with_error(path: Path) -> MockDocument:
-            nonlocal call_count
-            call_count += 1
             if "document.pdf" in str(path):
                 raise Exception("Corrupted file")
             return await original_extract(path)
@@ -394,15 +381,13 @@ class TestErrorHandling:
 
         assert len(documents) == 4
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_directory_not_found_raises(
         self,
         ingestion_service: IngestionService,
         tmp_path: Path,
     ) -> None:
         """Non-existent directory raises IngestionError."""
-        from medanki.ingestion.errors import IngestionError
-
         missing_dir = tmp_path / "nonexistent_dir"
 
         with pytest.raises(IngestionError) as exc_info: